@@ -98,6 +98,35 @@ parser.add_argument(
     default=os.getenv("PROVIDER"),
 )
 
+parser.add_argument(
+    "--ws-provider",
+    type=str,
+    help="Web3 websocket provider url, new blocks are pushed instead of polled",
+    default=os.getenv("WS_PROVIDER"),
+)
+
+parser.add_argument(
+    "--read-providers",
+    type=str,
+    nargs="+",
+    help="Additional Web3 provider urls that reads are spread over, transactions go through the one that answered fastest at startup",
+    default=os.getenv("READ_PROVIDERS"),
+)
+
+parser.add_argument(
+    "--tx-poll-latency",
+    type=float,
+    help="Seconds between polls for a transaction receipt, lower it on fast chains",
+    default=os.getenv("TX_POLL_LATENCY", 2.0),
+)
+
+parser.add_argument(
+    "--approve-tokens",
+    action="store_true",
+    help="Send unlimited approvals of the pool tokens to the Uniswap router and position manager at startup, where the allowance is low",
+    default=os.getenv("APPROVE_TOKENS", "").lower() == "true",
+)
+
 # Parse arguments
 args = parser.parse_args()
 
@@ -107,6 +136,10 @@ if args.allowed_users_passwords is not None:
         tuple(pair.split(",")) for pair in args.allowed_users_passwords.split()
     ]
 
+# Split read provider urls given as a single environment variable
+if isinstance(args.read_providers, str):
+    args.read_providers = args.read_providers.split()
+
 # Setup logging
 logging.basicConfig(
     level=logging.DEBUG if args.debug else logging.INFO,
@@ -123,6 +156,10 @@ trading_engine = engine.TradingEngine(
     range_percentage=args.range_percentage,
     token0_capital=args.token0_capital,
     provider=args.provider,
+    ws_provider=args.ws_provider,
+    read_providers=args.read_providers,
+    tx_poll_latency=args.tx_poll_latency,
+    approve_tokens=args.approve_tokens,
 )
 
 # Create trading API
@@ -137,4 +174,7 @@ trading_api = api.TradingEngineAPI(
 )
 
 if __name__ == "__main__":
-    trading_api.run()
+    try:
+        trading_api.run()
+    finally:
+        trading_engine.close()
@@ -33,6 +33,7 @@ setup(
         "pandas",
         "numpy",
         "jsonpickle",
+        "orjson",
         "python-dotenv",
         "argparse",
         "flask",
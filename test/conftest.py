@@ -0,0 +1,53 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from web3 import Web3
+
+from uniswap_hft.uniswap_v3.constants import MAX_APPROVAL_CHECK_INT, MAX_APPROVAL_INT
+from uniswap_hft.uniswap_v3.uniswap import Uniswap
+from uniswap_hft.web3_manager.web_manager import Web3Manager
+
+
+@pytest.fixture
+def bare_uniswap():
+    """Uniswap with the state set up by its constructor, without connecting to
+    a node. Contracts and RPCs are mocked by the tests that use them"""
+    uniswap = Uniswap.__new__(Uniswap)
+    uniswap.logger = logging.getLogger(__name__)
+    uniswap.w3 = Web3()
+    uniswap.address = "0x0000000000000000000000000000000000000001"
+    uniswap.private_key = "0x" + "02" * 32
+    uniswap.chain_id = 137
+    uniswap.max_approval_int = MAX_APPROVAL_INT
+    uniswap.max_approval_check_int = MAX_APPROVAL_CHECK_INT
+    uniswap._slot0_cache = (None, None)
+    uniswap._min_read_block = 0
+    uniswap._read_attempts = 2
+    uniswap._new_heads_subscribed = False
+    uniswap._slot0_refreshed_at = 0.0
+    uniswap._closed = threading.Event()
+    uniswap._new_heads_loop = None
+    uniswap._new_heads_task = None
+    uniswap._receipt_queue = queue.Queue()
+    uniswap._nonce_lock = threading.Lock()
+    uniswap._nonce = 0
+    uniswap._executor = ThreadPoolExecutor(max_workers=1)
+    yield uniswap
+    uniswap._executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def bare_web3_manager():
+    """Web3Manager with an empty position history, without a Uniswap instance"""
+    web3_manager = Web3Manager.__new__(Web3Manager)
+    web3_manager.logger = logging.getLogger(__name__)
+    web3_manager.position_history = []
+    web3_manager._history_events = []
+    web3_manager._history_file = None
+    web3_manager._history_log_events = 0
+    yield web3_manager
+    if web3_manager._history_file is not None:
+        web3_manager._history_file.close()
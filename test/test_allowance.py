@@ -0,0 +1,53 @@
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+
+from uniswap_hft.uniswap_v3.constants import MAX_APPROVAL_INT
+
+
+@pytest.fixture
+def uniswap(bare_uniswap):
+    uniswap = bare_uniswap
+    uniswap.router = MagicMock(address="router")
+    uniswap.nonFungiblePositionManager = MagicMock(address="position_manager")
+    uniswap.token0Contract = MagicMock(address="token0")
+    uniswap.token1Contract = MagicMock(address="token1")
+    uniswap._estimate_gas = MagicMock(return_value=50000)
+
+    def send(fn, gas):
+        receipt = Future()
+        receipt.set_result({"status": 1, "gas": gas})
+        return "0x00", receipt
+
+    uniswap._send = MagicMock(side_effect=send)
+    return uniswap
+
+
+def set_allowances(uniswap, allowances):
+    uniswap._multicall = MagicMock(
+        return_value=[uniswap.w3.codec.encode_single("uint256", a) for a in allowances]
+    )
+
+
+def test_check_allowance_approves_only_low_allowances(uniswap):
+    # token0 for router and position manager, then the same for token1
+    set_allowances(uniswap, [MAX_APPROVAL_INT, 0, MAX_APPROVAL_INT, 10])
+
+    receipts = uniswap.check_allowance()
+
+    assert receipts == [{"status": 1, "gas": 55000}, {"status": 1, "gas": 55000}]
+    uniswap.token0Contract.functions.approve.assert_called_once_with(
+        "position_manager", MAX_APPROVAL_INT
+    )
+    uniswap.token1Contract.functions.approve.assert_called_once_with(
+        "position_manager", MAX_APPROVAL_INT
+    )
+    assert uniswap.allowances[("token1", "position_manager")] == 10
+
+
+def test_check_allowance_sends_nothing_when_approved(uniswap):
+    set_allowances(uniswap, [MAX_APPROVAL_INT] * 4)
+
+    assert uniswap.check_allowance() == []
+    uniswap._send.assert_not_called()
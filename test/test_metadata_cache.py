@@ -0,0 +1,30 @@
+from uniswap_hft.uniswap_v3.util import TokenMetaCache
+
+
+def test_metadata_cache_roundtrip(tmp_path):
+    path = str(tmp_path / "cache" / "metadata.json")
+    TokenMetaCache(path).set(137, "0xABC", {"decimals": 6})
+
+    assert TokenMetaCache(path).get(137, "0xabc") == {"decimals": 6}
+
+
+def test_metadata_cache_unwritable_path_is_not_fatal(tmp_path):
+    # A file where the cache directory should be makes makedirs fail
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    cache = TokenMetaCache(str(blocker / "metadata.json"))
+
+    cache.set(137, "0xabc", {"decimals": 6})
+
+    assert cache.get(137, "0xabc") == {"decimals": 6}
+
+
+def test_metadata_cache_leaves_no_temporary_file_behind(tmp_path):
+    path = str(tmp_path / "metadata.json")
+    first, second = TokenMetaCache(path), TokenMetaCache(path)
+
+    first.set(137, "0xabc", {"decimals": 6})
+    second.set(137, "0xdef", {"decimals": 18})
+
+    assert TokenMetaCache(path).get(137, "0xdef") == {"decimals": 18}
+    assert [p.name for p in tmp_path.iterdir()] == ["metadata.json"]
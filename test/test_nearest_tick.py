@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from uniswap_hft.uniswap_v3.constants import MAX_TICK, MIN_TICK
+from uniswap_hft.uniswap_v3.uniswap import Uniswap
+from uniswap_hft.uniswap_v3.util import nearest_tick
+
+
+def test_nearest_tick_rounds_to_the_nearest_spacing():
+    assert nearest_tick(207299, fee=3000) == 207300
+    assert nearest_tick(207269, fee=3000) == 207240
+    assert nearest_tick(-207299, fee=3000) == -207300
+    assert nearest_tick(207299, fee=3000, tick_spacing=200) == 207200
+
+
+def test_nearest_tick_checks_bounds():
+    max_usable_tick = MAX_TICK // 60 * 60
+    assert nearest_tick(max_usable_tick, fee=3000) == max_usable_tick
+    assert nearest_tick(-max_usable_tick, fee=3000) == -max_usable_tick
+    with pytest.raises(AssertionError):
+        nearest_tick(MAX_TICK, fee=3000)
+    with pytest.raises(AssertionError):
+        nearest_tick(MIN_TICK, fee=3000)
+
+
+def test_mint_liquidity_rounds_ticks_to_nearest():
+    uniswap = Uniswap.__new__(Uniswap)
+    uniswap.logger = MagicMock()
+    uniswap.pool_fee = 3000
+    uniswap._tick_spacing = 60
+    uniswap.token0, uniswap.token1 = "token0", "token1"
+    uniswap._fn_mint = MagicMock()
+    uniswap._send = MagicMock()
+
+    uniswap.mint_liquidity(
+        tick_lower=207031, tick_upper=207299, amount_0=1, amount_1=1, recipient="me"
+    )
+
+    (params,) = uniswap._fn_mint.call_args[0]
+    assert params[3:5] == (207060, 207300)
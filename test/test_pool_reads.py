@@ -0,0 +1,98 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from web3 import Web3
+
+from uniswap_hft.uniswap_v3.uniswap import _SLOT0_TYPES, StaleReadError
+
+SLOT0 = (2**96, 0, 1, 1, 1, 0, True)
+
+
+def multicall_result(block_number, *results):
+    codec = Web3().codec
+    return_data = [codec.encode_abi(types, values) for types, values in results]
+    return codec.encode_abi(["uint256", "bytes[]"], [block_number, return_data])
+
+
+@pytest.fixture
+def uniswap(bare_uniswap):
+    bare_uniswap._slot0_params = ["slot0"]
+    bare_uniswap._slot0_and_liquidity_params = ["slot0", "liquidity"]
+    bare_uniswap._fast_call = MagicMock()
+    return bare_uniswap
+
+
+def test_get_slot0_is_a_single_multicall(uniswap):
+    uniswap._fast_call.return_value = multicall_result(100, (_SLOT0_TYPES, SLOT0))
+
+    assert uniswap.get_slot0() == (2**96, 0)
+    uniswap._fast_call.assert_called_once_with(["slot0"])
+    assert uniswap._slot0_cache == (100, SLOT0)
+
+
+def test_get_slot0_keeps_a_newer_cached_block(uniswap):
+    uniswap._fast_call.return_value = multicall_result(100, (_SLOT0_TYPES, SLOT0))
+    newer_slot0 = (2**97, 1, 1, 1, 1, 0, True)
+    uniswap._slot0_cache = (101, newer_slot0)
+
+    uniswap.get_slot0()
+
+    assert uniswap._slot0_cache == (101, newer_slot0)
+
+
+def test_quote_local_reads_slot0_and_liquidity_together(uniswap):
+    uniswap._fast_call.return_value = multicall_result(
+        100, (_SLOT0_TYPES, SLOT0), (["uint128"], [2 * 10**18])
+    )
+    uniswap.pool_fee = 600
+
+    # Matches the v3-core SwapMath test of the same swap
+    assert uniswap.quote_local(10**18, zero_for_one=False) == 666399946655997866
+    uniswap._fast_call.assert_called_once_with(["slot0", "liquidity"])
+
+
+def test_quote_local_without_liquidity_is_zero(uniswap):
+    uniswap._fast_call.return_value = multicall_result(
+        100, (_SLOT0_TYPES, SLOT0), (["uint128"], [0])
+    )
+    uniswap.pool_fee = 600
+
+    assert uniswap.quote_local(10**18, zero_for_one=True) == 0
+
+
+def test_get_slot0_serves_pushed_slot0_until_it_is_stale(uniswap):
+    uniswap._fast_call.return_value = multicall_result(100, (_SLOT0_TYPES, SLOT0))
+    pushed_slot0 = (2**97, 1, 1, 1, 1, 0, True)
+    uniswap._slot0_cache = (99, pushed_slot0)
+    uniswap._new_heads_subscribed = True
+    uniswap._slot0_refreshed_at = time.monotonic()
+
+    assert uniswap.get_slot0() == (2**97, 1)
+    uniswap._fast_call.assert_not_called()
+
+    # The subscription went quiet without disconnecting
+    uniswap._slot0_refreshed_at -= 60
+    assert uniswap.get_slot0() == (2**96, 0)
+    uniswap._fast_call.assert_called_once()
+
+
+def test_get_slot0_skips_reads_behind_the_last_mined_block(uniswap):
+    newer_slot0 = (2**97, 1, 1, 1, 1, 0, True)
+    uniswap._fast_call.side_effect = [
+        multicall_result(99, (_SLOT0_TYPES, SLOT0)),
+        multicall_result(100, (_SLOT0_TYPES, newer_slot0)),
+    ]
+    uniswap._min_read_block = 100
+
+    assert uniswap._read_slot0() == newer_slot0
+    assert uniswap._fast_call.call_count == 2
+
+
+def test_get_slot0_fails_when_every_read_is_behind(uniswap):
+    uniswap._fast_call.return_value = multicall_result(99, (_SLOT0_TYPES, SLOT0))
+    uniswap._min_read_block = 100
+
+    with pytest.raises(StaleReadError):
+        uniswap._read_slot0()
+    assert uniswap._slot0_cache == (None, None)
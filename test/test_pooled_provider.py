@@ -0,0 +1,93 @@
+import time
+
+import pytest
+import requests
+from web3.providers import BaseProvider
+
+from uniswap_hft.uniswap_v3.util import PooledHTTPProvider
+
+
+class FakeProvider(BaseProvider):
+    def __init__(self, name, down=False, error=requests.ConnectionError):
+        self.name = name
+        self.down = down
+        self.error = error
+        self.methods = []
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        if self.down:
+            raise self.error(f"{self.name} is down")
+        return {"jsonrpc": "2.0", "id": 1, "result": self.name}
+
+
+def test_pooled_provider_round_robins_reads():
+    primary, secondary = FakeProvider("primary"), FakeProvider("secondary")
+    provider = PooledHTTPProvider([primary, secondary])
+
+    results = [provider.make_request("eth_call", [])["result"] for _ in range(4)]
+
+    assert results == ["primary", "secondary", "primary", "secondary"]
+
+
+def test_pooled_provider_pins_sends_and_fails_over_reads():
+    primary, secondary = FakeProvider("primary"), FakeProvider("secondary", True)
+    provider = PooledHTTPProvider([primary, secondary])
+
+    for _ in range(3):
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+        assert provider.make_request("eth_blockNumber", [])["result"] == "primary"
+
+    assert "eth_sendRawTransaction" not in secondary.methods
+
+
+def test_pooled_provider_pins_the_fastest_provider():
+    slow = FakeProvider("slow")
+    down = FakeProvider("down", down=True)
+    fast = FakeProvider("fast")
+    slow.make_request = lambda method, params: time.sleep(0.05) or {"result": "slow"}
+    provider = PooledHTTPProvider([slow, down, fast])
+
+    provider.sort_by_latency()
+
+    assert provider.providers == [fast, slow, down]
+
+
+def test_pooled_provider_fails_over_on_http_errors():
+    limited = FakeProvider("limited", down=True, error=requests.HTTPError)
+    provider = PooledHTTPProvider([limited, FakeProvider("secondary")])
+
+    results = [provider.make_request("eth_call", [])["result"] for _ in range(2)]
+
+    assert results == ["secondary", "secondary"]
+
+
+def test_pooled_provider_keeps_block_number_reads_on_one_provider():
+    primary, secondary = FakeProvider("primary"), FakeProvider("secondary")
+    provider = PooledHTTPProvider([primary, secondary])
+
+    for _ in range(3):
+        provider.make_request("eth_call", [{}, "0x10"])
+
+    assert secondary.methods == []
+    assert provider.make_request("eth_call", [{}, "latest"])["result"] == "primary"
+    assert provider.make_request("eth_call", [{}, "latest"])["result"] == "secondary"
+
+
+def test_pooled_provider_sorts_http_errors_last():
+    unauthorized = FakeProvider("unauthorized", down=True, error=requests.HTTPError)
+    working = FakeProvider("working")
+    provider = PooledHTTPProvider([unauthorized, working])
+
+    provider.sort_by_latency()
+
+    assert provider.providers == [working, unauthorized]
+
+
+def test_pooled_provider_rejects_providers_on_different_chains():
+    polygon, mainnet = FakeProvider("0x89"), FakeProvider("0x1")
+    down = FakeProvider("down", down=True)
+
+    PooledHTTPProvider([polygon, FakeProvider("0x89"), down]).check_chain_id()
+    with pytest.raises(ValueError, match="different chains"):
+        PooledHTTPProvider([polygon, mainnet]).check_chain_id()
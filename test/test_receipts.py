@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from hexbytes import HexBytes
+
+
+def test_receipt_worker_fails_unexpected_errors_without_blocking_the_queue(
+    bare_uniswap,
+):
+    uniswap = bare_uniswap
+    uniswap._wait_for_receipt = MagicMock(
+        side_effect=[KeyError("blockHash"), {"status": 1, "blockNumber": 100}]
+    )
+    threading.Thread(target=uniswap._watch_receipts, daemon=True).start()
+
+    broken = uniswap._track_receipt(HexBytes("0x01"))
+    mined = uniswap._track_receipt(HexBytes("0x02"))
+
+    with pytest.raises(KeyError):
+        broken.result(timeout=5)
+    assert mined.result(timeout=5) == {"status": 1, "blockNumber": 100}
+    # Later reads must be at least at the block of the mined transaction
+    assert uniswap._min_read_block == 100
+
+
+def test_close_stops_the_receipt_worker_after_the_queued_receipts(bare_uniswap):
+    uniswap = bare_uniswap
+    uniswap.session = MagicMock()
+    uniswap._wait_for_receipt = MagicMock(return_value={"status": 1, "blockNumber": 1})
+    worker = threading.Thread(target=uniswap._watch_receipts, daemon=True)
+
+    mined = uniswap._track_receipt(HexBytes("0x01"))
+    uniswap.close()
+    worker.start()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert mined.result(timeout=0) == {"status": 1, "blockNumber": 1}
+    uniswap.session.close.assert_called_once()
+
+
+def test_close_cancels_the_new_heads_subscription(bare_uniswap):
+    uniswap = bare_uniswap
+    uniswap.session = MagicMock()
+    subscribed = threading.Event()
+
+    async def subscribe_new_heads():
+        uniswap._new_heads_loop = asyncio.get_running_loop()
+        uniswap._new_heads_task = asyncio.current_task()
+        subscribed.set()
+        await asyncio.sleep(60)
+
+    uniswap._subscribe_new_heads = subscribe_new_heads
+    watcher = threading.Thread(target=uniswap._watch_new_heads, daemon=True)
+    watcher.start()
+    assert subscribed.wait(timeout=5)
+
+    uniswap.close()
+    watcher.join(timeout=5)
+
+    assert not watcher.is_alive()
@@ -0,0 +1,76 @@
+import pytest
+import requests
+
+from uniswap_hft.uniswap_v3.uniswap import _is_transient, retry_on_exception
+
+
+def test_retry_on_exception_stops_after_retries():
+    calls = []
+
+    @retry_on_exception(retries=3, delay=0)
+    def failing():
+        calls.append(1)
+        raise requests.exceptions.ConnectionError("connection refused")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        failing()
+    assert len(calls) == 3
+
+
+def test_retry_on_exception_recovers_from_transient_error():
+    calls = []
+
+    @retry_on_exception(retries=3, delay=0)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise ValueError({"code": -32005, "message": "rate limit exceeded"})
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 2
+
+
+def test_retry_on_exception_raises_non_transient_error_at_once():
+    calls = []
+
+    @retry_on_exception(retries=3, delay=0)
+    def reverting():
+        calls.append(1)
+        raise ValueError("execution reverted")
+
+    with pytest.raises(ValueError):
+        reverting()
+    assert len(calls) == 1
+
+
+def test_retry_on_exception_retries_http_rate_limits():
+    calls = []
+    response = requests.Response()
+    response.status_code = 429
+
+    @retry_on_exception(retries=3, delay=0)
+    def rate_limited():
+        calls.append(1)
+        if len(calls) < 2:
+            raise requests.exceptions.HTTPError("Too Many Requests", response=response)
+        return "ok"
+
+    assert rate_limited() == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "error, transient",
+    [
+        ({"code": -32005, "message": "limit exceeded"}, True),
+        ({"code": 429, "message": "exceeded"}, True),
+        ({"code": -32000, "message": "Rate limit reached"}, True),
+        ({"code": -32000, "message": "request timed out"}, True),
+        ({"code": -32000, "message": "cannot operate on a separate state"}, False),
+        ({"code": -32000, "message": "failed to generate the trace"}, False),
+        ("execution reverted", False),
+    ],
+)
+def test_is_transient_matches_rate_limits_not_words_containing_rate(error, transient):
+    assert _is_transient(ValueError(error)) is transient
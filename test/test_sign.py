@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+
+@pytest.fixture
+def uniswap(bare_uniswap):
+    bare_uniswap._nonce = 5
+    bare_uniswap.w3 = MagicMock()
+    bare_uniswap.w3.eth.getTransactionCount.return_value = 5
+    return bare_uniswap
+
+
+def test_sign_does_not_use_up_a_nonce_when_the_fees_fail(uniswap):
+    uniswap._fee_params = MagicMock(
+        side_effect=requests.exceptions.ConnectionError("connection refused")
+    )
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        uniswap._sign(MagicMock(), gas=21000)
+
+    assert uniswap._nonce == 5
+
+
+def test_sign_takes_the_nonce_last(uniswap):
+    uniswap._fee_params = MagicMock(return_value={"gasPrice": 1})
+    fn = MagicMock()
+    fn.build_transaction.side_effect = lambda tx: dict(tx)
+
+    uniswap._sign(fn, gas=21000)
+
+    (transaction,) = fn.build_transaction.call_args[0]
+    assert "nonce" not in transaction
+    signed = uniswap.w3.eth.account.signTransaction.call_args[0][0]
+    assert signed["nonce"] == 5
+    assert uniswap._nonce == 6
+
+
+def test_fee_params_are_retried_before_the_nonce_is_taken(uniswap):
+    uniswap._supports_1559 = False
+    uniswap._gas_price_cache = (0.0, 0)
+    uniswap._gas_price_cache_ttl = 1.5
+    gas_price = MagicMock(
+        side_effect=[requests.exceptions.ConnectionError("connection refused"), 7]
+    )
+    type(uniswap.w3.eth).gasPrice = property(lambda _: gas_price())
+    fn = MagicMock()
+    fn.build_transaction.side_effect = lambda tx: dict(tx)
+
+    uniswap._sign(fn, gas=21000)
+
+    signed = uniswap.w3.eth.account.signTransaction.call_args[0][0]
+    assert signed["gasPrice"] == 7
+    assert signed["nonce"] == 5
@@ -0,0 +1,44 @@
+from uniswap_hft.uniswap_v3 import swap_math
+
+# Expected values from the Uniswap v3-core SwapMath tests
+# https://github.com/Uniswap/v3-core/blob/v1.0.0/test/SwapMath.spec.ts
+PRICE_1_1 = 2**96  # encodePriceSqrt(1, 1)
+PRICE_101_100 = 79623317895830914510639640423  # encodePriceSqrt(101, 100)
+PRICE_1000_100 = 250541448375047931186413801569  # encodePriceSqrt(1000, 100)
+LIQUIDITY = 2 * 10**18
+AMOUNT = 10**18
+FEE = 600
+
+
+def test_compute_swap_step_capped_at_price_target():
+    assert swap_math.compute_swap_step(
+        PRICE_1_1, PRICE_101_100, LIQUIDITY, AMOUNT, FEE
+    ) == (PRICE_101_100, 9975124224178055, 9925619580021728, 5988667735148)
+
+
+def test_compute_swap_step_fully_spent():
+    (
+        sqrt_price_next,
+        amount_in,
+        amount_out,
+        fee_amount,
+    ) = swap_math.compute_swap_step(PRICE_1_1, PRICE_1000_100, LIQUIDITY, AMOUNT, FEE)
+    assert amount_in == 999400000000000000
+    assert amount_out == 666399946655997866
+    assert fee_amount == 600000000000000
+    assert amount_in + fee_amount == AMOUNT
+    assert sqrt_price_next == swap_math.get_next_sqrt_price_from_input(
+        PRICE_1_1, LIQUIDITY, amount_in, False
+    )
+
+
+def test_get_amount_out_both_directions():
+    amount_out_one_for_zero = swap_math.get_amount_out(
+        PRICE_1_1, LIQUIDITY, AMOUNT, FEE, zero_for_one=False
+    )
+    amount_out_zero_for_one = swap_math.get_amount_out(
+        PRICE_1_1, LIQUIDITY, AMOUNT, FEE, zero_for_one=True
+    )
+    assert amount_out_one_for_zero == 666399946655997866
+    # At a 1:1 price the pool is symmetric
+    assert amount_out_zero_for_one == amount_out_one_for_zero
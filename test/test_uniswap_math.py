@@ -98,3 +98,19 @@ def test_get_ranges():
         207243,
         208196,
     )
+
+
+def test_price_to_tick_repeated_price():
+    assert token_manager.price_to_tick(1000) == token_manager.price_to_tick(1000)
+    assert token_manager.price_to_tick(1100.0) == 206290
+    assert token_manager.price_to_tick(1000) == 207243
+
+
+def test_get_ranges_reuses_cached_ticks():
+    token_manager.get_ranges(percentage=RANGE_PCT, current_price=CURRENT_PRICE)
+    hits = TokenManagement._price_to_tick.cache_info().hits
+
+    token_manager.get_ranges(percentage=RANGE_PCT, current_price=CURRENT_PRICE)
+
+    # The lower, current and upper ticks are all served from the cache
+    assert TokenManagement._price_to_tick.cache_info().hits == hits + 3
@@ -1,9 +1,16 @@
+from concurrent.futures import Future
 from unittest.mock import patch
 
 import pytest
+from hexbytes import HexBytes
 from web3.types import TxReceipt
 
-from uniswap_hft.web3_manager.web_manager import InsufficientFunds, Web3Manager
+from uniswap_hft.web3_manager import web_manager
+from uniswap_hft.web3_manager.web_manager import (
+    InsufficientFunds,
+    TransactionFailed,
+    Web3Manager,
+)
 
 
 @pytest.fixture
@@ -52,10 +59,9 @@ def test_swap_amounts_token0_to_token1(web3_manager):
         web3_manager.tokenManager.token0_decimal = 6
         web3_manager.tokenManager.token1_decimal = 18
         web3_manager.uniswap.get_current_price.return_value = 1000
-        web3_manager.uniswap.swap_token_input.return_value = "0x00"
-        web3_manager.uniswap.w3.eth.getTransactionReceipt.return_value = TxReceipt(
-            {"status": 1}
-        )
+        future_receipt = Future()
+        future_receipt.set_result(TxReceipt({"status": 1}))
+        web3_manager.uniswap.swap_token_input.return_value = ("0x00", future_receipt)
 
         result = web3_manager.swap_amounts()
 
@@ -76,10 +82,9 @@ def test_swap_amounts_token1_to_token0(web3_manager):
         web3_manager.tokenManager.token0_decimal = 6
         web3_manager.tokenManager.token1_decimal = 18
         web3_manager.uniswap.get_current_price.return_value = 1000
-        web3_manager.uniswap.swap_token_input.return_value = "0x00"
-        web3_manager.uniswap.w3.eth.getTransactionReceipt.return_value = TxReceipt(
-            {"status": 1}
-        )
+        future_receipt = Future()
+        future_receipt.set_result(TxReceipt({"status": 1}))
+        web3_manager.uniswap.swap_token_input.return_value = ("0x00", future_receipt)
 
         result = web3_manager.swap_amounts()
 
@@ -103,3 +108,113 @@ def test_swap_amounts_insufficient_funds(web3_manager):
 
         with pytest.raises(InsufficientFunds):
             web3_manager.swap_amounts()
+
+
+def test_position_history_event_log_roundtrip(
+    bare_web3_manager, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    web3_manager = bare_web3_manager
+
+    web3_manager._record_open({"tokenID": 1, "is_open": True, "tick_current": 0})
+    web3_manager.store_position_history()
+    web3_manager._record_update(tick_current=10)
+    web3_manager._record_update(is_open=False)
+    web3_manager.store_position_history()
+    web3_manager._history_file.close()
+
+    # A crash mid-write leaves an incomplete last line behind
+    with open("position_history.jsonl", "ab") as f:
+        f.write(b'{"type":"update","pa')
+
+    web3_manager.position_history = []
+    web3_manager.load_position_history()
+
+    assert web3_manager.position_history == [
+        {"tokenID": 1, "is_open": False, "tick_current": 10}
+    ]
+    # The replayed updates are compacted into a single open event
+    assert open("position_history.jsonl", "rb").read().splitlines() == [
+        b'{"type":"open","position":'
+        b'{"tokenID":1,"is_open":false,"tick_current":10}}'
+    ]
+
+
+def test_position_history_compacted_every_n_events(
+    bare_web3_manager, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(web_manager, "POSITION_HISTORY_COMPACT_EVERY", 3)
+    web3_manager = bare_web3_manager
+
+    web3_manager._record_open({"tokenID": 1, "tick_current": 0})
+    for tick in range(1, 4):
+        web3_manager._record_update(tick_current=tick)
+        web3_manager.store_position_history()
+
+    assert web3_manager._history_log_events == 1
+    assert open("position_history.jsonl", "rb").read().splitlines() == [
+        b'{"type":"open","position":{"tokenID":1,"tick_current":3}}'
+    ]
+
+    # Appending resumes on the compacted log
+    web3_manager._record_update(tick_current=4)
+    web3_manager.store_position_history()
+    web3_manager._history_file.close()
+    assert len(open("position_history.jsonl", "rb").read().splitlines()) == 2
+
+
+def test_close_position_reverted_receipt_keeps_position_open(bare_web3_manager):
+    web3_manager = bare_web3_manager
+    web3_manager.position_history = [{"tokenID": 1, "is_open": True}]
+
+    def sent(status):
+        future_receipt = Future()
+        future_receipt.set_result(
+            TxReceipt({"status": status, "transactionHash": HexBytes("0x01")})
+        )
+        return HexBytes("0x01"), future_receipt
+
+    with patch.object(web3_manager, "uniswap", create=True) as uniswap:
+        uniswap.decrease_liquidity.return_value = sent(0)
+        uniswap.collect_fees.return_value = sent(0)
+        uniswap.burn_token.return_value = sent(0)
+
+        with pytest.raises(TransactionFailed, match="Decrease liquidity"):
+            web3_manager.close_position(store_history=False)
+
+    assert web3_manager.position_history == [{"tokenID": 1, "is_open": True}]
+    assert web3_manager._history_events == []
+
+
+def test_open_position_reports_a_reverted_swap(bare_web3_manager):
+    web3_manager = bare_web3_manager
+    web3_manager.range_percentage = 10
+    web3_manager.wallet_address = "0x0000000000000000000000000000000000000001"
+    web3_manager._scale0 = 10**6
+    web3_manager._scale1 = 10**18
+
+    def sent(status):
+        future_receipt = Future()
+        future_receipt.set_result(
+            TxReceipt({"status": status, "transactionHash": HexBytes("0x01")})
+        )
+        return future_receipt
+
+    with patch.object(
+        web3_manager, "get_price_and_update_balance", return_value=1000.0
+    ), patch.object(
+        web3_manager, "tokenManager", create=True
+    ) as token_manager, patch.object(
+        web3_manager, "_send_swap", return_value=sent(0)
+    ), patch.object(
+        web3_manager, "uniswap", create=True
+    ) as uniswap:
+        token_manager.get_ranges.return_value = (900.0, 1000.0, 1100.0, 1, 2, 3)
+        token_manager.calculate_amounts.return_value = (1.0, 1000.0)
+        uniswap.mint_liquidity.return_value = (HexBytes("0x02"), sent(0))
+
+        with pytest.raises(TransactionFailed, match="Swap"):
+            web3_manager.open_position(store_history=False)
+
+    assert web3_manager.position_history == []
@@ -52,22 +52,37 @@ class TelegramAPIHandler:
         self.api_username = api_username
         self.api_password = api_password
         self.debug_mode = debug_mode
+        self._session: Union[aiohttp.ClientSession, None] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared client session, so the login and the command of
+        every bot command reuse one keep-alive connection to the API"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self, application=None) -> None:
+        """Closes the shared client session, used as the post_shutdown hook
+        of the bot application"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     @retry()
     async def get_jwt_token(self) -> Union[str, None]:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.api_url}/login",
-                json={"username": self.api_username, "password": self.api_password},
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data["access_token"]
-                else:
-                    logger.error("Failed to get JWT token")
-                    logger.info("Entering Debug Mode")
-                    self.debug_mode = True
-                    return None
+        session = self._get_session()
+        async with session.post(
+            f"{self.api_url}/login",
+            json={"username": self.api_username, "password": self.api_password},
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return data["access_token"]
+            else:
+                logger.error("Failed to get JWT token")
+                logger.info("Entering Debug Mode")
+                self.debug_mode = True
+                return None
 
     @retry()
     async def _execute_api_command(
@@ -86,21 +101,20 @@ class TelegramAPIHandler:
 
         access_token = await self.get_jwt_token()
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with aiohttp.ClientSession() as session:
-            request_func = getattr(session, method.lower())
-            async with request_func(
-                f"{self.api_url}/{command}",
-                headers=headers,
-                json=json,
-            ) as resp:
-                data = await resp.json()
-                data = pprint.pformat(data)
-                # Format data for Telegram
-                data = data.replace("'", "")
-                data = data.replace("{", "")
-                data = data.replace("}", "")
-                # data = data.replace(",", "\n")
-                data = data.replace(":", " - ")
+        request_func = getattr(self._get_session(), method.lower())
+        async with request_func(
+            f"{self.api_url}/{command}",
+            headers=headers,
+            json=json,
+        ) as resp:
+            data = await resp.json()
+            data = pprint.pformat(data)
+            # Format data for Telegram
+            data = data.replace("'", "")
+            data = data.replace("{", "")
+            data = data.replace("}", "")
+            # data = data.replace(",", "\n")
+            data = data.replace(":", " - ")
 
         await context.bot.send_message(context._chat_id, data)
         logger.info(f"{command} executed")
@@ -189,7 +203,7 @@ def main():
 
     print(args.token)
 
-    app = ApplicationBuilder().token(args.token).build()
+    app = ApplicationBuilder().token(args.token).post_shutdown(engine_app.close).build()
     app.add_handler(CommandHandler("start", engine_app.start))
     app.add_handler(CommandHandler("stop", engine_app.stop))
     app.add_handler(CommandHandler("stats", engine_app.stats))
@@ -1,4 +1,5 @@
 import logging
+from typing import List, Union
 
 from eth_typing.evm import ChecksumAddress
 
@@ -15,6 +16,10 @@ class TradingEngine:
         range_percentage: int,
         token0_capital: int,
         provider: str,
+        ws_provider: Union[str, None] = None,
+        read_providers: Union[List[str], None] = None,
+        tx_poll_latency: float = 2.0,
+        approve_tokens: bool = False,
         debug: bool = False,
     ):
         """Initializes the trading engine
@@ -27,6 +32,10 @@ class TradingEngine:
             range_percentage (int): Range of the position in percentage (e.g. 1 for 1%)
             token0_capital (int): How much of the funds should be used to provide liquidity for token0 (e.g. 1000 for 1000USDC). Note: it will be ~doubled for the total position size
             provider (str): Provider URL of the blockchain RPC, e.g. infura
+            ws_provider (str, optional): Websocket URL of the blockchain RPC, used to get new blocks pushed. Defaults to None.
+            read_providers (List[str], optional): Additional provider URLs that reads are spread over. Defaults to None.
+            tx_poll_latency (float, optional): Seconds between polls for a transaction receipt. Defaults to 2.0.
+            approve_tokens (bool, optional): Approve the router and the position manager for both pool tokens at startup. Defaults to False.
             debug (bool, optional): Whether to enable debug logging. Defaults to False.
         """
         self.running = False
@@ -45,6 +54,10 @@ class TradingEngine:
             range_percentage=range_percentage,
             token0_capital=token0_capital,
             provider=provider,
+            ws_provider=ws_provider,
+            read_providers=read_providers,
+            tx_poll_latency=tx_poll_latency,
+            approve_tokens=approve_tokens,
         )
 
         # Set running flag to true if position_history is_open is true
@@ -69,6 +82,12 @@ class TradingEngine:
         self.logger.info("Closed position: %s", self.web3_manager.position_history[-1])
         return self.web3_manager.position_history[-1]
 
+    def close(self):
+        """Releases the connections and background workers of the engine on
+        shutdown. An open position is left open, as on a restart"""
+        self.logger.info("Closing trading engine")
+        self.web3_manager.close()
+
     def update_engine(self) -> dict:
         if self.running:
             self.logger.debug("Updating trading engine")
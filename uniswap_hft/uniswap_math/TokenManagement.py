@@ -6,12 +6,23 @@
 - Calculates swap amounts when opening new LP after exiting previous range
 """
 
+import functools
 import math
 import typing
 from typing import Tuple
 
 import numpy
 
+# Natural log of the sqrt price ratio between neighbouring ticks, sqrt(1.0001)
+LOG_SQRT_TICK_BASE = math.log(math.sqrt(1.0001))
+
+
+@functools.lru_cache(maxsize=256)
+def _price_to_tick(price: float, decimal_scale: float) -> int:
+    """Converts a decimal adjusted price to a tick, cached as the polled price
+    and the range bounds derived from it repeat across calls"""
+    return round(abs(math.log(math.sqrt(decimal_scale * price)) / LOG_SQRT_TICK_BASE))
+
 
 class TokenManager:
     def __init__(
@@ -41,6 +52,8 @@ class TokenManager:
         self.token0_decimal = token0_decimal
         self.token1_decimal = token1_decimal
         self.Q96: int = 2**96
+        # Decimal adjustment of prices, fixed for the token pair
+        self._decimal_scale = 10 ** (self.token0_decimal - self.token1_decimal)
 
         # Calculate ranges
         (
@@ -93,9 +106,9 @@ class TokenManager:
         Returns:
             int: _description_
         """
-        base = math.sqrt(1.0001)
+        # Same as math.log(p, sqrt(1.0001)), with the base's log computed once
         p = price / self.Q96
-        return round(abs(math.log(p, base)))
+        return round(abs(math.log(p) / LOG_SQRT_TICK_BASE))
 
     def price_to_sqrt_price_x_96(self, price: float) -> float:
         """Converts a price to a sqrt price, useable by Uniswap V3
@@ -106,10 +119,7 @@ class TokenManager:
         Returns:
             int: The converted sqrt price value
         """
-        return (
-            math.sqrt((10 ** (self.token0_decimal - self.token1_decimal)) * price)
-            * self.Q96
-        )
+        return math.sqrt(self._decimal_scale * price) * self.Q96
 
     def sqrt_price_x_96_to_price(self, sqrt_price_x_96: int) -> float:
         """Converts a sqrt price to a price, useable by Uniswap V3
@@ -134,8 +144,7 @@ class TokenManager:
             float: The converted price value
         """
         tick_basis_constant = 1.0001
-        decimal_diff = self.token0_decimal - self.token1_decimal
-        return 1 / ((tick_basis_constant**tick) * (10**decimal_diff))
+        return 1 / ((tick_basis_constant**tick) * self._decimal_scale)
 
     def price_to_tick(self, price: float) -> int:
         """Converts a price to a tick, useable by Uniswap V3
@@ -146,9 +155,7 @@ class TokenManager:
         Returns:
             int: The converted tick value
         """
-        sqrt_price = self.price_to_sqrt_price_x_96(price)
-        tick = self.sqrt_price_x_96_to_tick(sqrt_price)
-        return tick
+        return _price_to_tick(price, self._decimal_scale)
 
     def price_to_sqrtp(self, price: float) -> int:
         """Converts a price to a sqrt price, useable by Uniswap V3
@@ -11,6 +11,9 @@ SIMPLE_CACHE_RPC_WHITELIST = cast(
     },
 )
 
+# Persistent cache of immutable pool and token metadata
+METADATA_CACHE_PATH = "~/.uniswap_hft/metadata.json"
+
 ETH_ADDRESS = "0x0000000000000000000000000000000000000000"
 WETH9_ADDRESS = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
 
@@ -72,9 +75,31 @@ _router_contract_addresses_v2 = {
 
 MAX_UINT_128 = (2**128) - 1
 
+# Max approval of a token, and the allowance below which it is renewed
+MAX_APPROVAL_INT = (1 << 256) - 1
+MAX_APPROVAL_CHECK_INT = (1 << 196) - 1
+
+# Gas limits of collect and burn when they are sent before the preceding
+# decreaseLiquidity is mined and cannot be estimated yet. Unused gas is refunded
+COLLECT_GAS_LIMIT = 300_000
+BURN_GAS_LIMIT = 200_000
+# Gas limit of a mint sent before the swap providing its tokens is mined,
+# initializing both ticks of the range costs the most
+MINT_GAS_LIMIT = 600_000
+
+# Seconds to wait for a sent transaction to be mined
+TX_RECEIPT_TIMEOUT = 120
+
+# Seconds between pings of the newHeads websocket, and the age after which
+# slot0 pushed over it is considered stale and read over HTTP again
+NEW_HEADS_HEARTBEAT = 15
+SLOT0_MAX_AGE = 30
+
 # Source: https://github.com/Uniswap/v3-core/blob/v1.0.0/contracts/libraries/TickMath.sol#L8-L11
 MIN_TICK = -887272
 MAX_TICK = -MIN_TICK
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
 
 # Source: https://github.com/Uniswap/v3-core/blob/v1.0.0/contracts/UniswapV3Factory.sol#L26-L31
 _tick_spacing = {100: 1, 500: 10, 3_000: 60, 10_000: 200}
@@ -0,0 +1,166 @@
+"""
+Offchain Uniswap V3 swap math on Python integers, used to quote swaps from a
+cached pool state without calling the Quoter contract.
+
+Adapted from:
+- https://github.com/Uniswap/v3-core/blob/v1.0.0/contracts/libraries/SqrtPriceMath.sol
+- https://github.com/Uniswap/v3-core/blob/v1.0.0/contracts/libraries/SwapMath.sol
+
+Python integers do not overflow, so the uint256 overflow branches of the
+Solidity libraries are not needed and the plain formulas are used instead.
+"""
+
+from typing import Tuple
+
+from .constants import MAX_SQRT_RATIO, MIN_SQRT_RATIO
+
+Q96 = 2**96
+FEE_DENOMINATOR = 10**6
+
+
+def _div_rounding_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Amount of token0 between two sqrt prices for a given liquidity"""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+
+    if round_up:
+        return _div_rounding_up(
+            _div_rounding_up(numerator1 * numerator2, sqrt_ratio_b_x96),
+            sqrt_ratio_a_x96,
+        )
+    return numerator1 * numerator2 // sqrt_ratio_b_x96 // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Amount of token1 between two sqrt prices for a given liquidity"""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    if round_up:
+        return _div_rounding_up(liquidity * (sqrt_ratio_b_x96 - sqrt_ratio_a_x96), Q96)
+    return liquidity * (sqrt_ratio_b_x96 - sqrt_ratio_a_x96) // Q96
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Next sqrt price after adding `amount_in` of the input token"""
+    if amount_in == 0:
+        return sqrt_price_x96
+
+    if zero_for_one:
+        # Rounds up, so the price moves at least as far as the exact amount
+        numerator1 = liquidity << 96
+        return _div_rounding_up(
+            numerator1 * sqrt_price_x96, numerator1 + amount_in * sqrt_price_x96
+        )
+    # Rounds down, so the price moves at most as far as the exact amount
+    return sqrt_price_x96 + (amount_in << 96) // liquidity
+
+
+def compute_swap_step(
+    sqrt_ratio_current_x96: int,
+    sqrt_ratio_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> Tuple[int, int, int, int]:
+    """Computes an exact input swap step within a single liquidity range
+
+    Args:
+        sqrt_ratio_current_x96 (int): Current sqrt price of the pool
+        sqrt_ratio_target_x96 (int): Sqrt price the step cannot go beyond
+        liquidity (int): Usable liquidity
+        amount_remaining (int): Input amount left to be swapped
+        fee_pips (int): Fee of the pool in hundredths of a bip (e.g. 3000 for 0.3%)
+
+    Returns:
+        Tuple[int, int, int, int]: next sqrt price, amount in, amount out, fee amount
+    """
+    zero_for_one = sqrt_ratio_current_x96 >= sqrt_ratio_target_x96
+    amount_remaining_less_fee = (
+        amount_remaining * (FEE_DENOMINATOR - fee_pips) // FEE_DENOMINATOR
+    )
+
+    if zero_for_one:
+        amount_in = get_amount0_delta(
+            sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, True
+        )
+    else:
+        amount_in = get_amount1_delta(
+            sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, True
+        )
+
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+    else:
+        sqrt_ratio_next_x96 = get_next_sqrt_price_from_input(
+            sqrt_ratio_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_ratio_next_x96 == sqrt_ratio_target_x96
+
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(
+                sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, True
+            )
+        amount_out = get_amount1_delta(
+            sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, False
+        )
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(
+                sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, True
+            )
+        amount_out = get_amount0_delta(
+            sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, False
+        )
+
+    if reached_target:
+        fee_amount = _div_rounding_up(amount_in * fee_pips, FEE_DENOMINATOR - fee_pips)
+    else:
+        # The remainder of the input is taken as fee
+        fee_amount = amount_remaining - amount_in
+
+    return sqrt_ratio_next_x96, amount_in, amount_out, fee_amount
+
+
+def get_amount_out(
+    sqrt_price_x96: int,
+    liquidity: int,
+    amount_in: int,
+    fee: int,
+    zero_for_one: bool,
+) -> int:
+    """Quotes an exact input swap against the current liquidity of a pool
+
+    The swap is assumed not to cross an initialized tick, which holds for
+    amounts that are small relative to the in-range liquidity.
+
+    Args:
+        sqrt_price_x96 (int): Current sqrt price of the pool
+        liquidity (int): Current in-range liquidity of the pool
+        amount_in (int): Input amount, including the fee
+        fee (int): Fee of the pool (e.g. 3000 for 0.3%)
+        zero_for_one (bool): True when swapping token0 for token1
+
+    Returns:
+        int: Output amount
+    """
+    sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+    _, _, amount_out, _ = compute_swap_step(
+        sqrt_price_x96, sqrt_price_limit_x96, liquidity, amount_in, fee
+    )
+    return amount_out
@@ -1,28 +1,104 @@
+import asyncio
+import json
 import logging
+import queue
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Callable, Union
+from typing import Any, Callable, List, Tuple, Union
 
+import aiohttp
+import requests
+from eth_account.datastructures import SignedTransaction
+from hexbytes import HexBytes
+from requests.adapters import HTTPAdapter
 from web3 import Web3
+from web3.contract import ContractFunction
+from web3.exceptions import TimeExhausted, TransactionNotFound
 from web3.types import TxReceipt
 
-from .constants import MAX_UINT_128, _netid_to_name
-from .util import (_get_eth_simple_cache_middleware, _load_contract,
+from . import swap_math
+from .constants import (MAX_APPROVAL_CHECK_INT, MAX_APPROVAL_INT, MAX_UINT_128,
+                        NEW_HEADS_HEARTBEAT, SLOT0_MAX_AGE, TX_RECEIPT_TIMEOUT,
+                        _netid_to_name)
+from .util import (PooledHTTPProvider, TokenMetaCache,
+                   _get_eth_simple_cache_middleware, _load_contract,
                    _str_to_addr, nearest_tick)
 
+logger = logging.getLogger(__name__)
+
+# Output types of UniswapV3Pool.slot0()
+_SLOT0_TYPES = ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"]
+
+
+# Errors of an RPC that may succeed when retried, if _is_transient agrees
+_RETRIABLE_ERRORS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.HTTPError,
+    ValueError,
+)
+# JSON-RPC error codes of rate limits (-32005 is "limit exceeded" of EIP-1474)
+_RATE_LIMIT_CODES = (-32005, 429)
+# Phrases of JSON-RPC error messages of rate limits and node side timeouts
+_TRANSIENT_PHRASES = ("rate limit", "too many requests", "timeout", "timed out")
+
+
+class StaleReadError(ValueError):
+    """Raised when every read came from a node behind the last mined transaction"""
+
+
+def _is_transient(e: Exception) -> bool:
+    """Checks if an error is worth retrying
+
+    JSON-RPC errors are raised by web3 as ValueError, only the timeout and
+    rate limit ones are transient, recognised by their code or message.
+    Reverts, invalid nonces etc. are not. Over HTTP, rate limits (429) and
+    server errors (5xx) are transient.
+
+    Args:
+        e (Exception): The caught exception
+
+    Returns:
+        bool: True if the call should be retried
+    """
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and (
+            e.response.status_code == 429 or e.response.status_code >= 500
+        )
+    if isinstance(e, StaleReadError):
+        return True
+    if isinstance(e, ValueError):
+        error = e.args[0] if e.args else None
+        if isinstance(error, dict) and error.get("code") in _RATE_LIMIT_CODES:
+            return True
+        message = str(e).lower()
+        return any(phrase in message for phrase in _TRANSIENT_PHRASES)
+    return True
+
 
 # Retry decorator
 def retry_on_exception(
     retries: int = 3,
-    delay: int = 5,
-    exceptions: tuple = (Exception,),
+    delay: float = 1,
+    max_delay: float = 30,
+    exceptions: tuple = (
+        requests.exceptions.Timeout,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.HTTPError,
+        TimeExhausted,
+        ValueError,
+    ),
 ) -> Callable:
-    """Retry decorator
+    """Retry decorator with exponential backoff and jitter
 
     Args:
-        retries (int, optional): Number of retries. Defaults to 3.
-        delay (int, optional): Delay between retries. Defaults to 5.
-        exceptions (tuple, optional): Exceptions to catch. Defaults to (Exception,).
+        retries (int, optional): Number of attempts in total. Defaults to 3.
+        delay (float, optional): Initial delay between attempts, doubled after each one. Defaults to 1.
+        max_delay (float, optional): Upper bound of the delay between attempts. Defaults to 30.
+        exceptions (tuple, optional): Exceptions to catch, only transient ones are retried. Defaults to timeout, connection, 429/5xx and JSON-RPC errors.
 
     Returns:
         Callable: Decorated function
@@ -34,13 +110,15 @@ def retry_on_exception(
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             """Wrapper"""
-            for _ in range(retries):
+            for attempt in range(retries):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    print(e)
-                    time.sleep(delay)
-            return func(*args, **kwargs)
+                    if not _is_transient(e) or attempt == retries - 1:
+                        raise
+                    logger.warning(f"{func.__name__} failed, retrying: {e}")
+                    backoff = min(delay * (2**attempt), max_delay)
+                    time.sleep(backoff + random.uniform(0, 0.1 * delay))
 
         return wrapper
 
@@ -56,6 +134,9 @@ class Uniswap:
         address: str,
         private_key: str,
         provider: str,
+        ws_provider: Union[str, None] = None,
+        read_providers: Union[List[str], None] = None,
+        tx_poll_latency: float = 2.0,
         debug: bool = False,
     ) -> None:
         """Initializes the Uniswap SDK
@@ -65,6 +146,9 @@ class Uniswap:
             address (str): Address of the wallet
             private_key (str, optional): Private key of the wallet. Defaults to None.
             provider (Web3, optional): Web3 provider. Defaults to None.
+            ws_provider (str, optional): Websocket RPC URL, used to keep slot0 up to date from pushed blocks. Defaults to None.
+            read_providers (List[str], optional): Additional HTTP RPC URLs, reads are spread over them and the provider round-robin. Transactions are sent through whichever endpoint answered fastest at startup. Defaults to None.
+            tx_poll_latency (float, optional): Seconds between polls for a transaction receipt when no websocket provider is used. Defaults to 2.0.
             version (int, optional): Uniswap version. Defaults to 3.
             debug (bool, optional): Debug mode. Defaults to False.
         """
@@ -74,31 +158,53 @@ class Uniswap:
         self.private_key = private_key
         self.debug = debug
         self.provider = provider
+        self.ws_provider = ws_provider
+        self.read_providers = read_providers or []
+        self.tx_poll_latency = tx_poll_latency
 
         # Create logger object
         self.logger = logging.getLogger(__name__)
 
-        # Create Web3 object
-        self.w3 = Web3(Web3.HTTPProvider(self.provider, request_kwargs={"timeout": 60}))
+        # Create Web3 object on a pooled keep-alive session, so every RPC
+        # reuses an open connection instead of doing a new TCP+TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        http_providers = [
+            Web3.HTTPProvider(
+                endpoint, request_kwargs={"timeout": 60}, session=self.session
+            )
+            for endpoint in [self.provider, *self.read_providers]
+        ]
+        if len(http_providers) == 1:
+            self.w3 = Web3(http_providers[0])
+        else:
+            # Transactions are sent through the endpoint that answers fastest
+            pooled_provider = PooledHTTPProvider(http_providers)
+            pooled_provider.check_chain_id()
+            pooled_provider.sort_by_latency()
+            self.w3 = Web3(pooled_provider)
+
         self.netid = int(self.w3.net.version)
         if self.netid in _netid_to_name:
             self.netname = _netid_to_name[self.netid]
         else:
             raise Exception(f"Unknown netid: {self.netid}")  # pragma: no cover
         self.logger.info(f"Using {self.w3} ('{self.netname}', netid: {self.netid})")
+        self.chain_id = self.w3.eth.chain_id
         # Add POA Middleware if network is polygon
-        if self.w3.net.version == "137":
+        if self.netid == 137:
             self.w3.middleware_onion.inject(_get_eth_simple_cache_middleware(), layer=0)
 
-        # This code automatically approves you for trading on the exchange.
+        # check_allowance approves you for trading on the exchange, it is only
+        # called on request (approve_tokens of Web3Manager), never implicitly.
         # max_approval is to allow the contract to exchange on your behalf.
         # max_approval_check checks that current approval is above a reasonable number
         # The program cannot check for max_approval each time because it decreases
         # with each trade.
-        max_approval_hex = f"0x{64 * 'f'}"
-        self.max_approval_int = int(max_approval_hex, 16)
-        max_approval_check_hex = f"0x{15 * '0'}{49 * 'f'}"
-        self.max_approval_check_int = int(max_approval_check_hex, 16)
+        self.max_approval_int = MAX_APPROVAL_INT
+        self.max_approval_check_int = MAX_APPROVAL_CHECK_INT
 
         # Load contracts
         # https://github.com/Uniswap/uniswap-v3-periphery/blob/main/deploys.md
@@ -137,22 +243,538 @@ class Uniswap:
             abi_name="uniswap-v3/pool",
             address=pool_address,
         )
-        self.token0 = self.pool.functions.token0().call()
-        self.token1 = self.pool.functions.token1().call()
+        # Pool tokens, fee tier and token decimals and symbols never change,
+        # so they are read once per chain and then loaded from the metadata
+        # cache, pools keyed by pool address and tokens by token address
+        self.metadata_cache = TokenMetaCache()
+        pool_metadata = self.metadata_cache.get(self.netid, pool_address)
+        if pool_metadata is None or "tick_spacing" not in pool_metadata:
+            pool_metadata = self._read_pool_metadata()
+            self.metadata_cache.set(self.netid, pool_address, pool_metadata)
+
+        self.token0 = pool_metadata["token0"]
+        self.token1 = pool_metadata["token1"]
         self.token0Contract = _load_contract(
             self.w3, abi_name="uniswap-v3/erc20", address=self.token0
         )
         self.token1Contract = _load_contract(
             self.w3, abi_name="uniswap-v3/erc20", address=self.token1
         )
-        self.token0_decimals = self.token0Contract.functions.decimals().call()
-        self.token1_decimals = self.token1Contract.functions.decimals().call()
+        token0_metadata, token1_metadata = self._get_token_meta(
+            [self.token0, self.token1]
+        )
+        self.token0_decimals = token0_metadata["decimals"]
+        self.token1_decimals = token1_metadata["decimals"]
+        self.token0_symbol = token0_metadata["symbol"]
+        self.token1_symbol = token1_metadata["symbol"]
         self.Q96 = 2**96
 
+        # The fee tier and tick spacing of a pool never change
+        self.pool_fee = pool_metadata["fee"]
+        self._tick_spacing = pool_metadata["tick_spacing"]
+        self._decimal_scale = 10 ** abs(self.token0_decimals - self.token1_decimals)
+        # Numerator of the inverted, decimal adjusted price: 2**192 * 10**decimals
+        self._price_numerator = (1 << 192) * self._decimal_scale
+
+        # Bind the write functions once with their ABI entry resolved, so
+        # binding arguments does not search and match the ABI on every call
+        npm = self.nonFungiblePositionManager
+        self._fn_mint = npm.get_function_by_name("mint")
+        self._fn_decrease_liquidity = npm.get_function_by_name("decreaseLiquidity")
+        self._fn_collect = npm.get_function_by_name("collect")
+        self._fn_burn = npm.get_function_by_name("burn")
+        self._fn_exact_in = self.router.get_function_by_name("exactInputSingle")
+
+        # Calldata of the recurring slot0 and balance reads never changes, so it
+        # is encoded once as (target, data) pairs
+        self._slot0_call = (self.pool.address, self.pool.encodeABI(fn_name="slot0"))
+        self._balance_calls = [
+            (
+                token_contract.address,
+                token_contract.encodeABI(fn_name="balanceOf", args=[self.address]),
+            )
+            for token_contract in (self.token0Contract, self.token1Contract)
+        ]
+        # The polled multicalls are prebuilt as complete eth_call requests.
+        # Multicall2 returns the block number with the results, so a cached
+        # read never needs a separate eth_blockNumber round trip
+        self._slot0_params = self._multicall_params([self._slot0_call])
+        liquidity_call = (self.pool.address, self.pool.encodeABI(fn_name="liquidity"))
+        self._slot0_and_liquidity_params = self._multicall_params(
+            [self._slot0_call, liquidity_call]
+        )
+        self._price_and_balances_params = self._multicall_params(
+            [self._slot0_call, *self._balance_calls]
+        )
+        self._balances_params = self._multicall_params(self._balance_calls)
+
+        # Use EIP-1559 fees where the chain supports them, priced from a
+        # short lived eth_feeHistory window instead of eth_gasPrice per tx
+        self._supports_1559 = "baseFeePerGas" in self.w3.eth.get_block("latest")
+        self._fee_cache = (0.0, 0, 0)  # (timestamp, max_fee, tip)
+        self._fee_cache_ttl = 3
+        # Legacy chains cache eth_gasPrice for a bit less than a block instead
+        self._gas_price_cache = (0.0, 0)  # (timestamp, gas_price)
+        self._gas_price_cache_ttl = 1.5
+
+        # Latest slot0 of the pool and the block it was read at. Only served
+        # without an RPC while the newHeads subscription keeps it fresh
+        self._slot0_cache = (None, None)  # (block_number, slot0)
+
+        # Block of the last mined transaction. Multicall reads at an older
+        # block come from a lagging node and are sent again, which moves on
+        # to the next pooled provider
+        self._min_read_block = 0
+        self._read_attempts = len(http_providers)
+
+        # With a websocket provider slot0 is refreshed on every new block in
+        # the background, and price/tick reads are served without any RPC
+        # while the last refresh is recent
+        self._new_heads_subscribed = False
+        self._slot0_refreshed_at = 0.0
+        self._new_head = threading.Condition()
+        self._head_number = None
+        # Set by close, stops the background workers
+        self._closed = threading.Event()
+        # Loop and task of the running subscription, for close to cancel it
+        self._new_heads_loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._new_heads_task: Union[asyncio.Task, None] = None
+        if self.ws_provider is not None:
+            threading.Thread(target=self._watch_new_heads, daemon=True).start()
+
+        # Write methods return right after sending, and a single background
+        # worker resolves the receipt futures of the sent transactions. None
+        # in the queue stops the worker
+        self._receipt_queue: "queue.Queue[Union[Tuple[HexBytes, Future], None]]" = (
+            queue.Queue()
+        )
+        self._receipt_worker = threading.Thread(
+            target=self._watch_receipts, daemon=True
+        )
+        self._receipt_worker.start()
+
+        # Nonces are tracked locally, as this is the only signer of the account
+        self._nonce_lock = threading.Lock()
+        self._nonce = self.w3.eth.getTransactionCount(self.address, "pending")
+
+        # Runs the independent pre-flight RPCs of a transaction concurrently
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+    def close(self) -> None:
+        """Stops the background workers and releases the pooled HTTP
+        connections and the pre-flight thread pool
+
+        The receipt worker still resolves the futures of the transactions
+        sent before, then exits. The newHeads subscription is cancelled.
+        """
+        self._closed.set()
+        self._receipt_queue.put(None)
+        if self._new_heads_task is not None:
+            try:
+                self._new_heads_loop.call_soon_threadsafe(self._new_heads_task.cancel)
+            except RuntimeError:
+                pass  # The subscription has just ended and closed its loop
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
     def _deadline(self) -> int:
         """Get a predefined deadline. 10min by default (same as the Uniswap SDK)."""
         return int(time.time()) + 10 * 60
 
+    def _get_gas_price(self) -> int:
+        """Get the legacy gas price, read at most once per cache TTL"""
+        timestamp, gas_price = self._gas_price_cache
+        if time.monotonic() - timestamp > self._gas_price_cache_ttl:
+            gas_price = self.w3.eth.gasPrice
+            self._gas_price_cache = (time.monotonic(), gas_price)
+        return gas_price
+
+    @retry_on_exception()
+    def _fee_params(self) -> dict:
+        """Get the fee fields of a transaction
+
+        Returns:
+            dict: maxFeePerGas and maxPriorityFeePerGas on EIP-1559 chains, gasPrice otherwise
+        """
+        if not self._supports_1559:
+            return {"gasPrice": self._get_gas_price()}
+
+        timestamp, max_fee, tip = self._fee_cache
+        if time.monotonic() - timestamp > self._fee_cache_ttl:
+            fee_history = self.w3.eth.fee_history(5, "latest", [50])
+            # The last base fee is the one of the next block
+            base_fee = fee_history["baseFeePerGas"][-1]
+            tips = sorted(reward[0] for reward in fee_history["reward"])
+            tip = tips[len(tips) // 2]
+            max_fee = 2 * base_fee + tip
+            self._fee_cache = (time.monotonic(), max_fee, tip)
+
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": tip, "type": 2}
+
+    def _multicall(self, calls: List[Tuple[str, str]]) -> List[bytes]:
+        """Executes read-only calls in a single eth_call through Multicall2
+
+        Args:
+            calls (List[Tuple[str, str]]): Pairs of target address and encoded call data
+
+        Returns:
+            List[bytes]: The return data of each call, in order
+        """
+        _, return_data = self.multicall2.functions.aggregate(calls).call()
+        return return_data
+
+    def _multicall_params(self, calls: List[Tuple[str, str]]) -> list:
+        """Builds the eth_call params of a Multicall2 aggregate for _fast_call
+
+        Args:
+            calls (List[Tuple[str, str]]): Pairs of target address and encoded call data
+
+        Returns:
+            list: eth_call params, the transaction and the block
+        """
+        data = self.multicall2.encodeABI(fn_name="aggregate", args=[calls])
+        return [{"to": self.multicall2.address, "data": data}, "latest"]
+
+    def _fast_call(self, params: list) -> bytes:
+        """Sends a prebuilt eth_call request straight to the provider
+
+        Skips encoding the call and the web3 middlewares and formatters, for
+        reads that are polled with the same request over and over.
+
+        Args:
+            params (list): eth_call params, the transaction and the block
+
+        Returns:
+            bytes: ABI encoded return data
+        """
+        response = self.w3.provider.make_request("eth_call", params)
+        if "error" in response:
+            # Raised like web3 does, so retry_on_exception handles it the same
+            raise ValueError(response["error"])
+        return HexBytes(response["result"])
+
+    def _fast_multicall(self, params: list) -> Tuple[int, List[bytes]]:
+        """Sends a prebuilt Multicall2 aggregate with _fast_call and decodes it
+
+        A node behind the block of the last mined transaction still returns
+        the state from before it, so such a read is sent again, once for each
+        provider.
+
+        Args:
+            params (list): eth_call params of a Multicall2 aggregate
+
+        Returns:
+            Tuple[int, List[bytes]]: Block number and return data of each call
+        """
+        for _ in range(self._read_attempts):
+            block_number, return_data = self.w3.codec.decode_abi(
+                ["uint256", "bytes[]"], self._fast_call(params)
+            )
+            if block_number >= self._min_read_block:
+                return block_number, return_data
+        raise StaleReadError(
+            f"Read at block {block_number} is behind block {self._min_read_block}"
+        )
+
+    def _read_pool_metadata(self) -> dict:
+        """Reads the tokens, fee and tick spacing of the pool with a single multicall
+
+        Returns:
+            dict: Pool metadata, as stored in the metadata cache
+        """
+        calls = [
+            (self.pool.address, self.pool.encodeABI(fn_name=fn_name))
+            for fn_name in ("token0", "token1", "fee", "tickSpacing")
+        ]
+        token0, token1, fee, tick_spacing = [
+            self.w3.codec.decode_single(abi_type, data)
+            for abi_type, data in zip(
+                ("address", "address", "uint24", "int24"), self._multicall(calls)
+            )
+        ]
+        return {
+            "token0": Web3.toChecksumAddress(token0),
+            "token1": Web3.toChecksumAddress(token1),
+            "fee": fee,
+            "tick_spacing": tick_spacing,
+        }
+
+    def _get_token_meta(self, tokens: List[str]) -> List[dict]:
+        """Gets the decimals and symbols of ERC20 tokens
+
+        Tokens missing from the metadata cache are read with a single
+        multicall and added to it.
+
+        Args:
+            tokens (List[str]): Addresses of the tokens
+
+        Returns:
+            List[dict]: {"decimals": int, "symbol": str} for each token
+        """
+        metadata = [self.metadata_cache.get(self.netid, token) for token in tokens]
+        missing = [token for token, meta in zip(tokens, metadata) if meta is None]
+        if missing:
+            # Any token contract can encode the ERC20 calls
+            erc20 = _load_contract(
+                self.w3, abi_name="uniswap-v3/erc20", address=missing[0]
+            )
+            calls = [
+                (token, erc20.encodeABI(fn_name=fn_name))
+                for token in missing
+                for fn_name in ("decimals", "symbol")
+            ]
+            return_data = self._multicall(calls)
+            for i, token in enumerate(missing):
+                token_metadata = {
+                    "decimals": self.w3.codec.decode_single(
+                        "uint8", return_data[2 * i]
+                    ),
+                    "symbol": self.w3.codec.decode_single(
+                        "string", return_data[2 * i + 1]
+                    ),
+                }
+                self.metadata_cache.set(self.netid, token, token_metadata)
+            metadata = [self.metadata_cache.get(self.netid, token) for token in tokens]
+        return metadata
+
+    def _watch_new_heads(self) -> None:
+        """Keeps the slot0 cache up to date from blocks pushed over the websocket,
+        reconnecting with a backoff if the subscription drops"""
+        delay = 1
+        while not self._closed.is_set():
+            try:
+                asyncio.run(self._subscribe_new_heads())
+                delay = 1
+            except asyncio.CancelledError:
+                break  # Cancelled by close
+            except Exception as e:
+                self.logger.warning(f"newHeads subscription failed: {e}")
+            self._closed.wait(delay)
+            delay = min(delay * 2, 60)
+
+    async def _subscribe_new_heads(self) -> None:
+        """Subscribes to newHeads and reads slot0 at every new block"""
+        self._new_heads_loop = asyncio.get_running_loop()
+        self._new_heads_task = asyncio.current_task()
+        if self._closed.is_set():
+            return
+        async with aiohttp.ClientSession() as session:
+            # Pings detect a silently stalled connection, which is then closed
+            async with session.ws_connect(
+                self.ws_provider, heartbeat=NEW_HEADS_HEARTBEAT
+            ) as ws:
+                await ws.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "eth_subscribe",
+                        "params": ["newHeads"],
+                    }
+                )
+                # First message is the subscription id
+                await ws.receive_json()
+                try:
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        head = json.loads(message.data)["params"]["result"]
+                        block_number = int(head["number"], 16)
+                        # Read at the latest block of the HTTP node, which may
+                        # lag the websocket one. A failed read skips this head
+                        # instead of dropping the subscription
+                        try:
+                            self._read_slot0()
+                        except Exception as e:
+                            self.logger.warning(
+                                "Reading slot0 at new block %s failed: %s",
+                                block_number,
+                                e,
+                            )
+                        else:
+                            self._slot0_refreshed_at = time.monotonic()
+                            self._new_heads_subscribed = True
+
+                        # Wake up the receipt worker to check the new block
+                        with self._new_head:
+                            self._head_number = block_number
+                            self._new_head.notify_all()
+                finally:
+                    self._new_heads_subscribed = False
+
+    def _watch_receipts(self) -> None:
+        """Waits for the receipts of sent transactions and resolves their futures
+
+        Transactions are awaited in the order they were sent, which matches
+        their nonce order, so one worker is enough for any number of them.
+        Only transient RPC errors are retried, and only until the receipt
+        timeout, so a bad transaction never holds up the ones behind it.
+        """
+        while True:
+            item = self._receipt_queue.get()
+            if item is None:
+                break  # Stopped by close
+            tx_hash, future = item
+            deadline = time.monotonic() + TX_RECEIPT_TIMEOUT
+            delay = 1
+            while True:
+                try:
+                    receipt = self._wait_for_receipt(
+                        tx_hash, max(deadline - time.monotonic(), 0)
+                    )
+                except Exception as e:
+                    if (
+                        not isinstance(e, _RETRIABLE_ERRORS)
+                        or not _is_transient(e)
+                        or time.monotonic() >= deadline
+                    ):
+                        future.set_exception(e)
+                        break
+                    self.logger.warning(
+                        f"Waiting for receipt of {tx_hash.hex()} failed, retrying: {e}"
+                    )
+                    time.sleep(delay)
+                    delay = min(delay * 2, 60)
+                else:
+                    self._min_read_block = max(
+                        self._min_read_block, receipt["blockNumber"]
+                    )
+                    future.set_result(receipt)
+                    break
+
+    def _wait_for_receipt(
+        self, tx_hash: HexBytes, timeout: float = TX_RECEIPT_TIMEOUT
+    ) -> TxReceipt:
+        """Waits for the receipt of a transaction
+
+        While the newHeads subscription is up the receipt is checked once per
+        pushed block, otherwise it is polled.
+
+        Args:
+            tx_hash (HexBytes): Hash of the sent transaction
+            timeout (float, optional): Seconds to wait for. Defaults to 120.
+
+        Returns:
+            TxReceipt: Transaction receipt
+        """
+        if not self._new_heads_subscribed:
+            return self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout, self.tx_poll_latency
+            )
+
+        deadline = time.monotonic() + timeout
+        while True:
+            head_number = self._head_number
+            try:
+                return self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeExhausted(
+                        f"Transaction {tx_hash.hex()} is not in the chain "
+                        f"after {timeout} seconds"
+                    )
+                # Also wakes up regularly in case the subscription dropped
+                with self._new_head:
+                    self._new_head.wait_for(
+                        lambda: self._head_number != head_number,
+                        timeout=min(remaining, 5),
+                    )
+
+    def _track_receipt(self, tx_hash: HexBytes) -> Future:
+        """Queues a sent transaction for the receipt worker
+
+        Args:
+            tx_hash (HexBytes): Hash of the sent transaction
+
+        Returns:
+            Future: Resolves to the TxReceipt once the transaction is mined
+        """
+        future: Future = Future()
+        self._receipt_queue.put((tx_hash, future))
+        return future
+
+    @retry_on_exception()
+    def get_token_balances(self) -> Tuple[int, int]:
+        """Gets the wallet balances of both pool tokens with a single multicall
+
+        Returns:
+            Tuple[int, int]: Balances of token0 and token1
+        """
+        _, return_data = self._fast_multicall(self._balances_params)
+        balance0, balance1 = [
+            self.w3.codec.decode_single("uint256", data) for data in return_data
+        ]
+        return balance0, balance1
+
+    def _cache_slot0(self, block_number: int, slot0: tuple) -> None:
+        """Stores slot0 read at a block, unless a newer one is cached already
+        (e.g. one pushed by the newHeads subscription)"""
+        cached_block_number = self._slot0_cache[0]
+        if cached_block_number is None or block_number >= cached_block_number:
+            self._slot0_cache = (block_number, slot0)
+
+    def _get_slot0(self) -> tuple:
+        """Gets slot0 of the pool from the cache while the newHeads subscription
+        keeps it up to date, otherwise with a single multicall
+
+        Returns:
+            tuple: slot0 of the pool (sqrtPriceX96, tick, ...)
+        """
+        # Already refreshed by the newHeads subscription, unless it went quiet
+        # or the last mined transaction is newer
+        if (
+            self._new_heads_subscribed
+            and time.monotonic() - self._slot0_refreshed_at < SLOT0_MAX_AGE
+            and self._slot0_cache[0] >= self._min_read_block
+        ):
+            return self._slot0_cache[1]
+        return self._read_slot0()
+
+    def _read_slot0(self) -> tuple:
+        """Reads slot0 of the pool with a single multicall and caches it
+
+        Returns:
+            tuple: slot0 of the pool (sqrtPriceX96, tick, ...)
+        """
+        block_number, return_data = self._fast_multicall(self._slot0_params)
+        slot0 = self.w3.codec.decode_abi(_SLOT0_TYPES, return_data[0])
+        self._cache_slot0(block_number, slot0)
+        return slot0
+
+    def _get_slot0_and_liquidity(self) -> Tuple[tuple, int]:
+        """Gets slot0 and the in-range liquidity of the pool with a single
+        multicall, so both are read at the same block
+
+        Returns:
+            Tuple[tuple, int]: slot0 and liquidity of the pool
+        """
+        block_number, return_data = self._fast_multicall(
+            self._slot0_and_liquidity_params
+        )
+        slot0 = self.w3.codec.decode_abi(_SLOT0_TYPES, return_data[0])
+        liquidity = self.w3.codec.decode_single("uint128", return_data[1])
+        self._cache_slot0(block_number, slot0)
+        return slot0, liquidity
+
+    @retry_on_exception()
+    def get_slot0(self) -> Tuple[int, int]:
+        """Gets the current sqrt price and tick of the pool from one slot0 read
+
+        Returns:
+            Tuple[int, int]: sqrtPriceX96 and tick of the pool
+        """
+        sqrt_price_x96, tick = self._get_slot0()[:2]
+        return sqrt_price_x96, tick
+
+    @retry_on_exception()
+    def get_current_tick(self) -> int:
+        """Gets the current tick of the pool
+
+        Returns:
+            int: The current tick of the pool
+        """
+        return self._get_slot0()[1]
+
     @retry_on_exception()
     def get_current_price(self) -> float:
         """Gets the current price of the pool
@@ -165,22 +787,220 @@ class Uniswap:
         # This value may not always be equal to SqrtTickMath getTickAtSqrtRatio(sqrtPriceX96) if the price is on a tick boundary.
         # https://docs.uniswap.org/contracts/v3/reference/core/interfaces/pool/IUniswapV3PoolState
 
-        currentPrice = self.pool.functions.slot0().call()[0]
-        # Decode the square root price
-        sqrt_price = currentPrice / self.Q96
+        return self._sqrt_price_to_price(self._get_slot0()[0])
+
+    def _sqrt_price_to_price(self, sqrtPriceX96: int) -> float:
+        """Converts a sqrtPriceX96 of the pool to a price like get_current_price"""
+        # sqrtPriceX96 is a Q64.96 fixed point number, so the squared price is
+        # sqrtPriceX96**2 / 2**192. Invert it to get WETH/USDC and adjust for
+        # decimals in integers, converting to float only in the final division
+        return self._price_numerator / (sqrtPriceX96 * sqrtPriceX96)
+
+    @retry_on_exception()
+    def get_price_and_balances(self) -> Tuple[float, int, int]:
+        """Gets the current price and the wallet balances of both pool tokens
+        with a single multicall
+
+        The slot0 read also updates the slot0 served while the newHeads
+        subscription is up, unless a newer one is cached.
+
+        Returns:
+            Tuple[float, int, int]: Current price, balance of token0 and token1
+        """
+        block_number, return_data = self._fast_multicall(
+            self._price_and_balances_params
+        )
+        slot0 = self.w3.codec.decode_abi(_SLOT0_TYPES, return_data[0])
+        balance0, balance1 = [
+            self.w3.codec.decode_single("uint256", data) for data in return_data[1:]
+        ]
+
+        self._cache_slot0(block_number, slot0)
 
-        # square it to get USDC/WETH
-        price_usdc_per_weth = sqrt_price**2
+        return self._sqrt_price_to_price(slot0[0]), balance0, balance1
 
-        # Invert it to get WETH/USDC
-        price_weth_per_usdc = 1 / price_usdc_per_weth
+    def _next_nonce(self) -> int:
+        """Gets the next nonce of the account without an RPC"""
+        with self._nonce_lock:
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
 
-        # Adjust for decimals
-        decimal_diff = abs(self.token0_decimals - self.token1_decimals)
-        price_weth_per_usdc = price_weth_per_usdc * 10**decimal_diff
-        return price_weth_per_usdc
+    def _resync_nonce(self) -> None:
+        """Reads the nonce of the account from the node again"""
+        with self._nonce_lock:
+            self._nonce = self.w3.eth.getTransactionCount(self.address, "pending")
 
     @retry_on_exception()
+    def _estimate_gas(self, fn: ContractFunction, tx_params: dict) -> int:
+        """Estimates the gas of a transaction, retried as it has no side effects"""
+        return fn.estimateGas(tx_params)
+
+    def _sign(
+        self,
+        fn: ContractFunction,
+        value: int = 0,
+        gas: Union[int, None] = None,
+    ) -> SignedTransaction:
+        """Builds and signs a contract transaction with the next nonce
+
+        The nonce is taken last, right before signing, and read from the node
+        again on any error, so a failed build never leaves a gap in the nonces.
+
+        Args:
+            fn (ContractFunction): Contract function with its arguments bound
+            value (int, optional): Wei sent with the transaction. Defaults to 0.
+            gas (int, optional): Gas limit, estimated with a 10% margin when None.
+
+        Returns:
+            SignedTransaction: The signed transaction
+        """
+        tx_params = {"from": self.address}
+        if value:
+            tx_params["value"] = value
+
+        # Refresh the fees while the gas is estimated, so a stale fee cache
+        # does not add a second round trip before sending
+        fee_params = self._executor.submit(self._fee_params)
+
+        try:
+            # Estimate the gas and increase it by 10% to avoid underestimation
+            if gas is None:
+                gas = int(self._estimate_gas(fn, tx_params) * 1.1)
+
+            # Errors of the fee refresh surface here, before a nonce is taken
+            fees = fee_params.result()
+
+            transaction = fn.build_transaction(
+                {**tx_params, "gas": gas, **fees, "chainId": self.chain_id}
+            )
+            transaction["nonce"] = self._next_nonce()
+            return self.w3.eth.account.signTransaction(transaction, self.private_key)
+        except Exception:
+            self._resync_nonce()
+            raise
+
+    def _send(
+        self,
+        fn: ContractFunction,
+        value: int = 0,
+        gas: Union[int, None] = None,
+    ) -> Tuple[HexBytes, Future]:
+        """Builds, signs and sends a contract transaction
+
+        Sending is not retried, as a request that timed out may still have
+        reached the node and a retry would send the transaction twice. Only
+        the read-only pre-flight calls are retried.
+
+        Args:
+            fn (ContractFunction): Contract function with its arguments bound
+            value (int, optional): Wei sent with the transaction. Defaults to 0.
+            gas (int, optional): Gas limit, estimated with a 10% margin when None.
+
+        Returns:
+            Tuple[HexBytes, Future]: Transaction hash and a future of its receipt
+        """
+        signed_txn = self._sign(fn, value=value, gas=gas)
+        try:
+            tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
+        except Exception:
+            # The nonce was not used, or the local one is out of sync (e.g.
+            # "nonce too low"), so read it from the node before failing
+            self._resync_nonce()
+            raise
+
+        # Return without waiting, the receipt is resolved in the background
+        return tx_hash, self._track_receipt(tx_hash)
+
+    @retry_on_exception()
+    def quote_local(self, amount_in: int, zero_for_one: bool) -> int:
+        """Quotes an exact input swap in the pool with local v3 math
+
+        Reads slot0 and liquidity in one multicall instead of simulating the
+        swap with the Quoter, assuming the swap stays within the current
+        liquidity range. Use `self.quoter` when an exact quote across ticks is
+        needed.
+
+        Args:
+            amount_in (int): Input amount, including the fee
+            zero_for_one (bool): True when swapping token0 for token1
+
+        Returns:
+            int: Output amount
+        """
+        slot0, liquidity = self._get_slot0_and_liquidity()
+        # Nothing can be swapped while the price is outside every position
+        if liquidity == 0:
+            return 0
+
+        return swap_math.get_amount_out(
+            sqrt_price_x96=slot0[0],
+            liquidity=liquidity,
+            amount_in=amount_in,
+            fee=self.pool_fee,
+            zero_for_one=zero_for_one,
+        )
+
+    def check_allowance(self) -> List[TxReceipt]:
+        """Approves the router and the position manager for both pool tokens
+        where the current allowance is below max_approval_check_int
+
+        The four allowances are read with a single multicall. The required
+        approvals are sent back-to-back with consecutive nonces and their
+        receipts are awaited together.
+
+        Returns:
+            List[TxReceipt]: Transaction receipts of the sent approvals
+        """
+        spenders = (self.router.address, self.nonFungiblePositionManager.address)
+        pairs = [
+            (token_contract, spender)
+            for token_contract in (self.token0Contract, self.token1Contract)
+            for spender in spenders
+        ]
+        calls = [
+            (
+                token_contract.address,
+                token_contract.encodeABI(
+                    fn_name="allowance", args=[self.address, spender]
+                ),
+            )
+            for token_contract, spender in pairs
+        ]
+
+        # Allowances keyed by (token address, spender address)
+        self.allowances = {}
+        to_approve = []
+        for (token_contract, spender), data in zip(pairs, self._multicall(calls)):
+            allowance = self.w3.codec.decode_single("uint256", data)
+            self.allowances[(token_contract.address, spender)] = allowance
+            if allowance < self.max_approval_check_int:
+                to_approve.append((token_contract, spender))
+
+        if not to_approve:
+            return []
+
+        approve_fns = []
+        for token_contract, spender in to_approve:
+            self.logger.info(f"Approving {spender} for {token_contract.address}")
+            approve_fns.append(
+                token_contract.functions.approve(spender, self.max_approval_int)
+            )
+
+        # Estimate the approvals concurrently, then send them back-to-back with
+        # consecutive nonces through the pinned provider and await all receipts
+        tx_params = {"from": self.address}
+        gas_estimates = list(
+            self._executor.map(
+                lambda fn: self._estimate_gas(fn, tx_params), approve_fns
+            )
+        )
+        futures = [
+            self._send(fn, gas=int(gas * 1.1))[1]
+            for fn, gas in zip(approve_fns, gas_estimates)
+        ]
+        return [future.result(timeout=2 * TX_RECEIPT_TIMEOUT) for future in futures]
+
     def mint_liquidity(
         self,
         tick_lower: int,
@@ -189,72 +1009,70 @@ class Uniswap:
         amount_1: int,
         recipient: str,
         deadline: Union[int, None] = None,
-    ) -> TxReceipt:
+        gas: Union[int, None] = None,
+    ) -> Tuple[HexBytes, Future]:
         """Mint liquidity in a Uniswap v3 pool
 
+        Args:
+            gas (int, optional): Gas limit, estimated when None. Set it when the
+                tokens are still arriving from a pending transaction.
+
         Returns:
-            TxReceipt: Transaction receipt
+            Tuple[HexBytes, Future]: Transaction hash and a future of its receipt
+
+        Raises:
+            ValueError: If the tick range is empty after rounding to the tick spacing
         """
-        fee = self.pool.functions.fee().call()
-        assert tick_lower < tick_upper, "Invalid tick range"
+        fee = self.pool_fee
 
         # Set deadline
         if deadline is None:
             deadline = self._deadline()
 
-        # Adjust for tick spacing
-        tick_lower = nearest_tick(tick_lower, fee=fee)
-        tick_upper = nearest_tick(tick_upper, fee=fee)
+        # Round to the nearest usable ticks with the cached tick spacing. The
+        # range is checked after rounding, as that is what reaches the contract
+        tick_lower = nearest_tick(tick_lower, fee, self._tick_spacing)
+        tick_upper = nearest_tick(tick_upper, fee, self._tick_spacing)
+        if tick_lower >= tick_upper:
+            raise ValueError(
+                f"invalid tick range after rounding: {tick_lower}>={tick_upper}"
+            )
+
+        # MintParams in struct order: token0, token1, fee, tickLower, tickUpper,
+        # amount0Desired, amount1Desired, amount0Min, amount1Min, recipient, deadline
+        params = (
+            self.token0,
+            self.token1,
+            fee,
+            tick_lower,
+            tick_upper,
+            amount_0,
+            amount_1,
+            0,  # or any other minimum you want to set
+            0,  # or any other minimum you want to set
+            recipient,
+            deadline,
+        )
+        # Lazily formatted, so it costs nothing unless debug logging is on
+        self.logger.debug("mint_liquidity params: %s", params)
 
-        # Create a dict of arguments
-        params = {
-            "token0": self.token0,
-            "token1": self.token1,
-            "fee": fee,
-            "tickLower": tick_lower,
-            "tickUpper": tick_upper,
-            "amount0Desired": amount_0,
-            "amount1Desired": amount_1,
-            "amount0Min": 0,  # or any other minimum you want to set
-            "amount1Min": 0,  # or any other minimum you want to set
-            "recipient": recipient,
-            "deadline": deadline,
-        }
+        return self._send(self._fn_mint(params), gas=gas)
 
-        # Estimate the gas required for transaction
-        gas_estimate = self.nonFungiblePositionManager.functions.mint(
-            params
-        ).estimateGas({"from": self.address})
-
-        # Increase gas estimate by 10%
-        gas_estimate = int(gas_estimate * 1.1)
-
-        # Create the transaction that NonFungiblePositionManager will sign
-        nonce = self.w3.eth.getTransactionCount(self.address)
-        chain_id = (
-            self.w3.eth.chain_id
-        )  # using `chain_id` instead of deprecated `chainId`
-
-        transaction = {
-            "nonce": nonce,
-            "gas": gas_estimate,
-            "gasPrice": self.w3.eth.gasPrice,
-            "to": self.nonFungiblePositionManager.address,
-            "data": self.nonFungiblePositionManager.encodeABI(
-                fn_name="mint", args=[params]
-            ),
-            "chainId": chain_id,
-        }
+    @retry_on_exception()
+    def get_position(self, tokenId: int) -> tuple:
+        """Gets a position from the NonfungiblePositionManager
 
-        # Sign the transaction and send it
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-        tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
+        Args:
+            tokenId (int): Id of the position NFT
 
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
+        Returns:
+            tuple: The position, liquidity is at index 7
+        """
+        return self.nonFungiblePositionManager.functions.positions(tokenId).call()
 
-    @retry_on_exception()
-    def decrease_liquidity(self, tokenId: int, deadline: int = 2**64) -> TxReceipt:
+    def decrease_liquidity(
+        self, tokenId: int, deadline: int = 2**64
+    ) -> Tuple[HexBytes, Future]:
         """
         Burns liquidity from the pool by using a tokenId
         """
@@ -263,7 +1081,7 @@ class Uniswap:
         if deadline is None:
             deadline = self._deadline()
 
-        position = self.nonFungiblePositionManager.functions.positions(tokenId).call()
+        position = self.get_position(tokenId)
 
         # Set up the parameters
         params = {
@@ -274,43 +1092,18 @@ class Uniswap:
             "deadline": deadline,
         }
 
-        # Estimate the gas
-        gas_estimate = self.nonFungiblePositionManager.functions.decreaseLiquidity(
-            params
-        ).estimateGas()
-
-        # Increase the gas estimate by 10% to avoid underestimation
-        gas_estimate = int(gas_estimate * 1.1)
-
-        # Create the transaction that NonFungiblePositionManager will sign
-        nonce = self.w3.eth.getTransactionCount(self.address)
-        chain_id = self.w3.eth.chain_id
-
-        transaction = {
-            "nonce": nonce,
-            "gas": gas_estimate,
-            "gasPrice": self.w3.eth.gasPrice,
-            "to": self.nonFungiblePositionManager.address,
-            "data": self.nonFungiblePositionManager.encodeABI(
-                fn_name="decreaseLiquidity", args=[params]
-            ),
-            "chainId": chain_id,
-        }
-
-        # Sign the transaction
-        signed_txn = self.w3.eth.account.signTransaction(transaction, self.private_key)
+        return self._send(self._fn_decrease_liquidity(params))
 
-        # Send the transaction
-        tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-
-        # Wait for the transaction to be mined, and get the transaction receipt
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
-
-    @retry_on_exception()
-    def collect_fees(self, tokenId: int):
+    def collect_fees(
+        self, tokenId: int, gas: Union[int, None] = None
+    ) -> Tuple[HexBytes, Future]:
         """
         Collects fees for the specified tokenId
+
+        Args:
+            tokenId (int): Id of the position NFT
+            gas (int, optional): Gas limit, estimated when None. Pass one when
+                the preceding decrease_liquidity is not mined yet.
         """
 
         # Set up the parameters
@@ -321,78 +1114,22 @@ class Uniswap:
             "amount1Max": MAX_UINT_128,
         }
 
-        # Estimate the gas
-        gas_estimate = self.nonFungiblePositionManager.functions.collect(
-            params
-        ).estimateGas()
-
-        # Increase the gas estimate by 10% to avoid underestimation
-        gas_estimate = int(gas_estimate * 1.1)
-
-        # Create the transaction that NonFungiblePositionManager will sign
-        nonce = self.w3.eth.getTransactionCount(self.address)
-        chain_id = self.w3.eth.chain_id
-
-        transaction = {
-            "nonce": nonce,
-            "gas": gas_estimate,
-            "gasPrice": self.w3.eth.gasPrice,
-            "to": self.nonFungiblePositionManager.address,
-            "data": self.nonFungiblePositionManager.encodeABI(
-                fn_name="collect", args=[params]
-            ),
-            "chainId": chain_id,
-        }
-
-        # Sign the transaction
-        signed_txn = self.w3.eth.account.signTransaction(transaction, self.private_key)
-
-        # Send the transaction
-        tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-
-        # Wait for the transaction to be mined, and get the transaction receipt
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
+        return self._send(self._fn_collect(params), gas=gas)
 
-    @retry_on_exception()
-    def burn_token(self, tokenId: int):
+    def burn_token(
+        self, tokenId: int, gas: Union[int, None] = None
+    ) -> Tuple[HexBytes, Future]:
         """
         Burns liquidity from the pool by using a tokenId
-        """
-        # Estimate the gas
-        gas_estimate = self.nonFungiblePositionManager.functions.burn(
-            tokenId
-        ).estimateGas()
-
-        # Increase the gas estimate by 10% to avoid underestimation
-        gas_estimate = int(gas_estimate * 1.1)
-
-        # Create the transaction that NonFungiblePositionManager will sign
-        nonce = self.w3.eth.getTransactionCount(self.address)
-        chain_id = self.w3.eth.chain_id
-
-        transaction = {
-            "nonce": nonce,
-            "gas": gas_estimate,
-            "gasPrice": self.w3.eth.gasPrice,
-            "to": self.nonFungiblePositionManager.address,
-            "data": self.nonFungiblePositionManager.encodeABI(
-                fn_name="burn", args=[tokenId]
-            ),
-            "chainId": chain_id,
-        }
 
-        # Sign the transaction
-        signed_txn = self.w3.eth.account.signTransaction(transaction, self.private_key)
-
-        # Send the transaction
-        tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-
-        # Wait for the transaction to be mined, and get the transaction receipt
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
+        Args:
+            tokenId (int): Id of the position NFT
+            gas (int, optional): Gas limit, estimated when None. Pass one when
+                the preceding collect_fees is not mined yet, as the estimate
+                reverts until the position is cleared.
+        """
+        return self._send(self._fn_burn(tokenId), gas=gas)
 
-    @retry_on_exception()
     def swap_token_input(
         self,
         token_in_address: str,
@@ -400,7 +1137,7 @@ class Uniswap:
         amount_in: int,
         pool_fee: int = 3000,
         deadline: Union[int, None] = None,
-    ):
+    ) -> Tuple[HexBytes, Future]:
         """
         Swaps `amount_in` of `token_in` for `token_out` using Uniswap V3
         """
@@ -421,25 +1158,4 @@ class Uniswap:
             "sqrtPriceLimitX96": 0,
         }
 
-        # Create the transaction that the SwapRouter will sign
-        nonce = self.w3.eth.getTransactionCount(self.address)
-        chain_id = self.w3.eth.chain_id
-
-        transaction = {
-            "nonce": nonce,
-            "gas": int(8e6),  # gas_estimate,
-            "gasPrice": self.w3.eth.gasPrice,
-            "to": self.router.address,
-            "data": self.router.encodeABI(fn_name="exactInputSingle", args=[params]),
-            "chainId": chain_id,
-        }
-
-        # Sign the transaction
-        signed_txn = self.w3.eth.account.signTransaction(transaction, self.private_key)
-
-        # Send the transaction
-        tx_hash = self.w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-
-        # Wait for the transaction to be mined, and get the transaction receipt
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
+        return self._send(self._fn_exact_in(params), gas=int(8e6))
@@ -1,20 +1,29 @@
 import functools
+import itertools
 import json
+import logging
 import math
 import os
-from typing import (Any, Dict, Generator, List, Sequence, Tuple, Type, Union,
-                    cast)
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, Dict, Generator, List, Optional, Sequence, Tuple,
+                    Type, Union, cast)
 
 import lru
+import requests
 from eth_typing.evm import Address
 from web3 import Web3
 from web3.contract import Contract
 from web3.exceptions import NameNotFound
 from web3.middleware.cache import construct_simple_cache_middleware
-from web3.types import Middleware
+from web3.providers import BaseProvider
+from web3.types import Middleware, RPCEndpoint, RPCResponse
 
-from .constants import (MAX_TICK, MIN_TICK, SIMPLE_CACHE_RPC_WHITELIST,
-                        _tick_spacing)
+from .constants import (MAX_TICK, METADATA_CACHE_PATH, MIN_TICK,
+                        SIMPLE_CACHE_RPC_WHITELIST, _tick_spacing)
+
+logger = logging.getLogger(__name__)
 
 
 def _get_eth_simple_cache_middleware() -> Middleware:
@@ -55,6 +64,7 @@ def _validate_address(a: Address) -> None:
     assert _addr_to_str(a)
 
 
+@functools.lru_cache(maxsize=None)
 def _load_abi(name: str) -> str:
     path = f"{os.path.dirname(os.path.abspath(__file__))}/assets/"
     with open(os.path.abspath(path + f"{name}.abi")) as f:
@@ -68,6 +78,141 @@ def _load_contract(w3: Web3, abi_name: str, address: str) -> Contract:
     return w3.eth.contract(address=address, abi=_load_abi(abi_name))  # type: ignore
 
 
+class TokenMetaCache:
+    """Persistent store of immutable on-chain metadata (pool tokens, decimals,
+    fee tier), keyed by chain id and contract address"""
+
+    def __init__(self, path: str = METADATA_CACHE_PATH) -> None:
+        self.path = os.path.expanduser(path)
+        try:
+            with open(self.path) as f:
+                self._data: Dict[str, Dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    @staticmethod
+    def _key(chain_id: int, address: str) -> str:
+        return f"{chain_id}:{address.lower()}"
+
+    def get(self, chain_id: int, address: str) -> Optional[Dict[str, Any]]:
+        return self._data.get(self._key(chain_id, address))
+
+    def set(self, chain_id: int, address: str, metadata: Dict[str, Any]) -> None:
+        self._data[self._key(chain_id, address)] = metadata
+
+        # Write to a temporary file first so a crash never leaves a torn file.
+        # Its name is unique, so processes sharing the cache never write to the
+        # same one. The cache is only an optimization, so an unwritable path
+        # is not fatal
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False
+            ) as f:
+                json.dump(self._data, f)
+            try:
+                os.replace(f.name, self.path)
+            except OSError:
+                os.remove(f.name)
+                raise
+        except OSError as e:
+            logger.warning("Writing the metadata cache failed: %s", e)
+
+
+class PooledHTTPProvider(BaseProvider):
+    """Spreads JSON-RPC reads over several HTTP providers
+
+    Reads go to the providers round-robin and fail over to the next one on a
+    connection error, timeout or HTTP error status (e.g. 429 or 5xx). Reads
+    at a given block number start at the first provider, as a node that is a
+    block behind the one the number came from answers "header not found".
+    Sending transactions and reading the nonce always go to the first
+    provider, so the nonce is read from the node that has seen every sent
+    transaction. sort_by_latency makes that the fastest one, check_chain_id
+    makes sure they are all on the same network.
+    """
+
+    _pinned_methods = {
+        "eth_sendRawTransaction",
+        "eth_sendTransaction",
+        "eth_getTransactionCount",
+    }
+    # Methods whose last param is the block to read at
+    _block_methods = {"eth_call", "eth_getBalance", "eth_getCode", "eth_getStorageAt"}
+    _failover_errors = (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+    def __init__(self, providers: List[BaseProvider]) -> None:
+        self.providers = providers
+        self._next_index = itertools.count()
+
+    def check_chain_id(self) -> None:
+        """Checks that all providers are on the same chain, so reads never come
+        from another network than the transactions are sent to. Unreachable
+        ones are skipped"""
+
+        def chain_id(provider: BaseProvider) -> Optional[str]:
+            try:
+                return provider.make_request(RPCEndpoint("eth_chainId"), [])["result"]
+            except requests.RequestException:
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
+            chain_ids = list(executor.map(chain_id, self.providers))
+        if len(set(chain_ids) - {None}) > 1:
+            raise ValueError(
+                "Providers are on different chains: "
+                f"{dict(zip(map(str, self.providers), chain_ids))}"
+            )
+
+    def sort_by_latency(self) -> None:
+        """Orders the providers by the latency of an eth_blockNumber call, so
+        the fastest one gets the pinned methods. Unreachable ones and ones
+        answering with an HTTP error go last"""
+
+        def latency(provider: BaseProvider) -> float:
+            start = time.monotonic()
+            try:
+                provider.make_request(RPCEndpoint("eth_blockNumber"), [])
+            except requests.RequestException:
+                return math.inf
+            return time.monotonic() - start
+
+        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
+            latencies = list(executor.map(latency, self.providers))
+        order = sorted(range(len(self.providers)), key=latencies.__getitem__)
+        self.providers = [self.providers[i] for i in order]
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method in self._pinned_methods:
+            return self.providers[0].make_request(method, params)
+
+        if self._is_block_number_read(method, params):
+            start = 0
+        else:
+            start = next(self._next_index)
+        for i in range(len(self.providers)):
+            provider = self.providers[(start + i) % len(self.providers)]
+            try:
+                return provider.make_request(method, params)
+            except self._failover_errors:
+                if i == len(self.providers) - 1:
+                    raise
+
+    def _is_block_number_read(self, method: RPCEndpoint, params: Any) -> bool:
+        """Checks if a read is pinned to a block number rather than a tag"""
+        if method not in self._block_methods or not params:
+            return False
+        block = params[-1]
+        return isinstance(block, str) and block.startswith("0x")
+
+    def isConnected(self) -> bool:
+        return self.providers[0].isConnected()
+
+    def __str__(self) -> str:
+        return f"Pooled providers {[str(p) for p in self.providers]}"
+
+
 def _load_contract_erc20(w3: Web3, address: Address) -> Contract:
     return _load_contract(w3, "erc20", address)
 
@@ -107,13 +252,22 @@ def default_tick_range(fee: int) -> Tuple[int, int]:
     return min_tick, max_tick
 
 
-def nearest_tick(tick: int, fee: int) -> int:
-    min_tick, max_tick = default_tick_range(fee)
+def nearest_tick(tick: int, fee: int, tick_spacing: Optional[int] = None) -> int:
+    """Rounds a tick to the nearest usable tick of a pool
+
+    Args:
+        tick (int): Tick to round
+        fee (int): Fee of the pool, used to look up the tick spacing
+        tick_spacing (int, optional): Tick spacing of the pool, when already known.
+    """
+    if tick_spacing is None:
+        tick_spacing = _tick_spacing[fee]
+    min_tick = -(MIN_TICK // -tick_spacing) * tick_spacing
+    max_tick = (MAX_TICK // tick_spacing) * tick_spacing
     assert (
         min_tick <= tick <= max_tick
     ), f"Provided tick is out of bounds: {(min_tick, max_tick)}"
 
-    tick_spacing = _tick_spacing[fee]
     rounded_tick_spacing = round(tick / tick_spacing) * tick_spacing
 
     if rounded_tick_spacing < min_tick:
@@ -1,20 +1,48 @@
-import datetime
-import json
 import logging
+import os
+import tempfile
 import time
-from typing import Tuple, Union
+from concurrent.futures import Future
+from typing import List, Tuple, Union
 
+import orjson
 from eth_typing.evm import ChecksumAddress
+from web3 import Web3
 from web3.types import TxReceipt
 
 from uniswap_hft.uniswap_math import TokenManagement
+from uniswap_hft.uniswap_v3.constants import (
+    BURN_GAS_LIMIT,
+    COLLECT_GAS_LIMIT,
+    MINT_GAS_LIMIT,
+    TX_RECEIPT_TIMEOUT,
+)
 from uniswap_hft.uniswap_v3.uniswap import Uniswap
 
+# Required amounts are raised by 1% to account for swap-mint slippage
+SWAP_MINT_SLIPPAGE_PCT = 1
+
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+
+# Append-only log of position history events, one JSON object per line
+POSITION_HISTORY_PATH = "position_history.jsonl"
+# Full history written by earlier versions, carried over to the log once
+LEGACY_POSITION_HISTORY_PATH = "position_history.json"
+# Update events appended to the log before it is rewritten as a snapshot
+POSITION_HISTORY_COMPACT_EVERY = 1000
+# Upper bound on waiting for a receipt future, the receipt worker gives up
+# after TX_RECEIPT_TIMEOUT plus at most one retry backoff
+RECEIPT_WAIT_TIMEOUT = 2 * TX_RECEIPT_TIMEOUT
+
 
 class InsufficientFunds(Exception):
     pass
 
 
+class TransactionFailed(Exception):
+    pass
+
+
 class Web3Manager:
     """Class for managing the web3 connection and the uniswap contract
     1. Init the class with the provider and the uniswap contract
@@ -31,6 +59,10 @@ class Web3Manager:
         range_percentage: int,
         token0_capital: int,
         provider: str,
+        ws_provider: Union[str, None] = None,
+        read_providers: Union[List[str], None] = None,
+        tx_poll_latency: float = 2.0,
+        approve_tokens: bool = False,
         debug: bool = False,
     ):
         """Initilizes a pool with an associated wallet and a percentage
@@ -43,6 +75,10 @@ class Web3Manager:
             range_percentage (int): How wide the range should be in percentage (e.g. 1 for 1%)
             token0_capital (int): How much of the funds should be used to provide liquidity for token0 (e.g. 1000 for 1000USDC). Note: it will be ~doubled for the total position size
             provider (str): The provider of the blockchain, e.g. infura
+            ws_provider (str, optional): Websocket endpoint of the provider, used to get new blocks pushed instead of polling. Defaults to None.
+            read_providers (List[str], optional): Additional HTTP endpoints that reads are spread over, transactions go through the one that answered fastest at startup. Defaults to None.
+            tx_poll_latency (float, optional): Seconds between polls for a transaction receipt when no websocket provider is used. Defaults to 2.0.
+            approve_tokens (bool, optional): Send unlimited approvals of both pool tokens to the router and the position manager where the allowance is low. Defaults to False.
             debug (bool, optional): Whether to enable debug logging. Defaults to False.
 
         """
@@ -54,6 +90,9 @@ class Web3Manager:
         self.range_percentage = range_percentage
         self.token0_capital = token0_capital
         self.provider = provider
+        self.ws_provider = ws_provider
+        self.read_providers = read_providers
+        self.tx_poll_latency = tx_poll_latency
 
         self.logger = logging.getLogger(__name__)  # Retrieve the logger object
 
@@ -63,6 +102,9 @@ class Web3Manager:
 
         # Initialize variables
         self.position_history = []
+        self._history_events = []
+        self._history_file = None
+        self._history_log_events = 0  # Events in the log file
         """
         position_history = [
             {
@@ -92,81 +134,222 @@ class Web3Manager:
             address=self.wallet_address,
             private_key=self.wallet_private_key,
             provider=self.provider,
+            ws_provider=self.ws_provider,
+            read_providers=self.read_providers,
+            tx_poll_latency=self.tx_poll_latency,
         )
 
+        # Approvals are sent only when explicitly requested
+        if approve_tokens:
+            self.uniswap.check_allowance()
+
         self.decimal0 = self.uniswap.token0_decimals
         self.decimal1 = self.uniswap.token1_decimals
+        self._scale0 = 10**self.decimal0
+        self._scale1 = 10**self.decimal1
         self.token0 = self.uniswap.token0
         self.token1 = self.uniswap.token1
         self.token0_contract = self.uniswap.token0Contract
         self.token1_contract = self.uniswap.token1Contract
         self.pool_contract = self.uniswap.pool
-        self.token0_symbol = self.token0_contract.functions.symbol().call()
-        self.token1_symbol = self.token1_contract.functions.symbol().call()
+        self._npm_address = self.uniswap.nonFungiblePositionManager.address
+        self.token0_symbol = self.uniswap.token0_symbol
+        self.token1_symbol = self.uniswap.token1_symbol
 
-        # Initialize tokenManager
+        # Initialize tokenManager, and get token amount from pool address
         self.tokenManager = TokenManagement.TokenManager(
-            current_price=self.uniswap.get_current_price(),
+            current_price=self.get_price_and_update_balance(),
             range_pct=self.range_percentage,
             target_amount=self.token0_capital,
             token0_decimal=self.decimal0,
             token1_decimal=self.decimal1,
         )
 
-        # Get token amount from pool address
-        self.update_balance()
-
         # Log pool info line by line
         self.logger.info("Pool info:")
-        self.logger.info(f"Pool address: {self.pool_address}")
-        self.logger.info(f"Swap pool fee: {self.pool_fee}")
-        self.logger.info(f"Wallet address: {self.wallet_address}")
-        self.logger.info(f"Range percentage: {self.range_percentage}")
-        self.logger.info(f"Token0 capital: {self.token0_capital}")
-        self.logger.info(f"Provider: {self.provider}")
-        self.logger.info(f"Decimal0: {self.decimal0}")
-        self.logger.info(f"Decimal1: {self.decimal1}")
-        self.logger.info(f"Token0: {self.token0}")
-        self.logger.info(f"Token1: {self.token1}")
-        self.logger.info(f"Token0 symbol: {self.token0_symbol}")
-        self.logger.info(f"Token1 symbol: {self.token1_symbol}")
-        self.logger.info(f"Token0 balance: {self.token0Balance}")
-        self.logger.info(f"Token1 balance: {self.token1Balance}")
-
-        # Try to load position history
-        try:
-            self.load_position_history()
-            self.logger.info("Position history loaded")
-        except:
+        self.logger.info("Pool address: %s", self.pool_address)
+        self.logger.info("Swap pool fee: %s", self.pool_fee)
+        self.logger.info("Wallet address: %s", self.wallet_address)
+        self.logger.info("Range percentage: %s", self.range_percentage)
+        self.logger.info("Token0 capital: %s", self.token0_capital)
+        self.logger.info("Provider: %s", self.provider)
+        self.logger.info("Websocket provider: %s", self.ws_provider)
+        self.logger.info("Read providers: %s", self.read_providers)
+        self.logger.info("Transaction poll latency: %s", self.tx_poll_latency)
+        self.logger.info("Decimal0: %s", self.decimal0)
+        self.logger.info("Decimal1: %s", self.decimal1)
+        self.logger.info("Token0: %s", self.token0)
+        self.logger.info("Token1: %s", self.token1)
+        self.logger.info("Token0 symbol: %s", self.token0_symbol)
+        self.logger.info("Token1 symbol: %s", self.token1_symbol)
+        self.logger.info("Token0 balance: %s", self.token0Balance)
+        self.logger.info("Token1 balance: %s", self.token1Balance)
+
+        # Load position history, a malformed one is reported instead of failing
+        if os.path.exists(POSITION_HISTORY_PATH) or os.path.exists(
+            LEGACY_POSITION_HISTORY_PATH
+        ):
+            try:
+                self.load_position_history()
+                self.logger.info("Position history loaded")
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                self.logger.warning("Position history unreadable: %s", e)
+        else:
             self.logger.info("Position history not found")
 
+    def close(self):
+        """Stores the pending position history and releases the history log
+        and the connections and background workers of Uniswap"""
+        self.store_position_history()
+        if self._history_file is not None:
+            self._history_file.close()
+            self._history_file = None
+        self.uniswap.close()
+
     def store_position_history(self):
-        """Store the position history in a json file"""
-        with open("position_history.json", "w") as f:
-            json.dump(self.position_history, f)
+        """Store the position history changes in a jsonl event log
+
+        Only the events recorded since the last store are appended, so the
+        bytes written do not grow with the length of the history.
+        """
+        if not self._history_events:
+            return
+
+        if self._history_file is None:
+            self._history_file = open(POSITION_HISTORY_PATH, "ab")
+        self._history_file.write(
+            b"".join(
+                orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
+                for event in self._history_events
+            )
+        )
+        self._history_file.flush()
+        self._history_log_events += len(self._history_events)
+        self._history_events = []
+
+        # Every poll appends an update, so the log is compacted regularly to
+        # keep its size and the replay at startup bounded
+        if (
+            self._history_log_events - len(self.position_history)
+            >= POSITION_HISTORY_COMPACT_EVERY
+        ):
+            self.compact_position_history()
+
+    def compact_position_history(self):
+        """Rewrite the jsonl event log as one open event per position
+
+        The snapshot is written to a temporary file that replaces the log, so
+        a crash leaves either the old or the new log behind.
+        """
+        if self._history_file is not None:
+            self._history_file.close()
+            self._history_file = None
+
+        directory = os.path.dirname(os.path.abspath(POSITION_HISTORY_PATH))
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+            f.write(
+                b"".join(
+                    orjson.dumps(
+                        {"type": "open", "position": position},
+                        option=orjson.OPT_APPEND_NEWLINE,
+                    )
+                    for position in self.position_history
+                )
+            )
+        os.replace(f.name, POSITION_HISTORY_PATH)
+        self._history_log_events = len(self.position_history)
 
     def load_position_history(self):
-        """Load the position history from a json file"""
-        with open("position_history.json", "r") as f:
-            self.position_history = json.load(f)
+        """Load the position history by replaying the jsonl event log"""
+        if not os.path.exists(POSITION_HISTORY_PATH) and os.path.exists(
+            LEGACY_POSITION_HISTORY_PATH
+        ):
+            with open(LEGACY_POSITION_HISTORY_PATH, "rb") as f:
+                for position in orjson.loads(f.read()):
+                    self._record_open(position)
+            self.store_position_history()
+            return
+
+        with open(POSITION_HISTORY_PATH, "rb+") as f:
+            data = f.read()
+            # A crash mid-write leaves a partial last line, drop it so the
+            # next event is not appended to it
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                self.logger.warning("Dropping incomplete position history event")
+                f.truncate(end)
+
+        position_history = []
+        lines = data[:end].splitlines()
+        for line in lines:
+            event = orjson.loads(line)
+            if event["type"] == "open":
+                position_history.append(event["position"])
+            else:
+                position_history[-1].update(event["patch"])
+        self.position_history = position_history
+        self._history_log_events = len(lines)
+
+        # Replayed updates are folded into a snapshot, so the next start
+        # does not replay them again
+        if self._history_log_events > len(position_history):
+            self.compact_position_history()
+
+    def _record_open(self, position: dict):
+        """Appends a new position to the history and queues it for storing
+
+        Args:
+            position (dict): The opened position
+        """
+        self.position_history.append(position)
+        self._history_events.append({"type": "open", "position": dict(position)})
+
+    def _record_update(self, **fields):
+        """Updates the last position of the history and queues the changed fields
+        for storing
+
+        Args:
+            **fields: The changed fields of the position
+        """
+        self.position_history[-1].update(fields)
+        self._history_events.append({"type": "update", "patch": fields})
 
     def update_balance(self):
         """Updates the balances of the wallet for token0 and token1"""
-        self.token0Balance = self.token0_contract.functions.balanceOf(
-            self.wallet_address
-        ).call()
-        self.token1Balance = self.token1_contract.functions.balanceOf(
-            self.wallet_address
-        ).call()
+        self.token0Balance, self.token1Balance = self.uniswap.get_token_balances()
+
+    def get_price_and_update_balance(self) -> float:
+        """Updates the balances of the wallet and reads the current price,
+        together in a single call
+
+        Returns:
+            float: Current price of the pool
+        """
+        (
+            current_price,
+            self.token0Balance,
+            self.token1Balance,
+        ) = self.uniswap.get_price_and_balances()
+        return current_price
+
+    def check_receipt(self, receipt: TxReceipt, step: str) -> None:
+        """Raises if a transaction was mined but reverted
+
+        Args:
+            receipt (TxReceipt): Receipt of the transaction
+            step (str): Name of the step, used in the error message
+
+        Raises:
+            TransactionFailed: If the status of the receipt is not 1
+        """
+        if receipt["status"] != 1:
+            e_msg = f"{step} transaction {receipt['transactionHash'].hex()} reverted"
+            self.logger.error(e_msg)
+            raise TransactionFailed(e_msg)
 
     def get_current_time_str(self) -> str:
         """Returns the current time as a string"""
-        # Save position history
-        last_update = time.time()
-        last_update_str = datetime.datetime.fromtimestamp(last_update).strftime(
-            "%Y-%m-%d %H:%M:%S"
-        )
-        return last_update_str
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
 
     def parseTxReceiptForTokenId(self, rc: TxReceipt) -> int:
         """Parses a tx receipt for the tokenId
@@ -180,54 +363,83 @@ class Web3Manager:
         # logs_mint = self.pool_contract.events.Mint().processReceipt(rc)
         # sender = logs_mint[0]["args"]["sender"]
 
-        logs_transfer = (
-            self.uniswap.nonFungiblePositionManager.events.Transfer().processReceipt(rc)
-        )
-        return logs_transfer[0]["args"]["tokenId"]
-
-    def swap_amounts(self) -> Union[TxReceipt, None]:
+        # The NFT Transfer is the only log of the position manager with this topic,
+        # and its tokenId is indexed, so it can be read without decoding the ABI
+        for log in rc["logs"]:
+            topics = log["topics"]
+            if log["address"] == self._npm_address and topics[0] == TRANSFER_TOPIC:
+                return int.from_bytes(topics[3], "big")
+        raise ValueError("No position NFT transfer found in the receipt")
+
+    def swap_amounts(
+        self, current_price: Union[float, None] = None
+    ) -> Union[TxReceipt, None]:
         """Swaps the tokens in the wallet for the token with the least amount
 
+        Args:
+            current_price (float, optional): Current price of the pool, when the
+                caller already read it. Read from the pool when None.
+
         Raises:
             Exception: If both or none of the token amounts are 0
+            TransactionFailed: If the swap reverted
 
         Returns:
             TxReceipt: Transaction receipt of the swap
         """
+        future_receipt = self._send_swap(current_price=current_price)
+        if future_receipt is None:
+            return None
+        receipt = future_receipt.result(timeout=RECEIPT_WAIT_TIMEOUT)
+        self.check_receipt(receipt, "Swap")
+        return receipt
+
+    def _send_swap(
+        self, current_price: Union[float, None] = None
+    ) -> Union[Future, None]:
+        """Sends the swap of swap_amounts without waiting for it to be mined
+
+        Args:
+            current_price (float, optional): Current price of the pool, when the
+                caller already read it. Read from the pool when None.
+
+        Raises:
+            Exception: If both or none of the token amounts are 0
+
+        Returns:
+            Future: Resolves to the receipt of the swap, None if no swap is needed
+        """
         # Get existing token amounts
         existing_amount0 = self.token0Balance  # USDC
         existing_amount1 = self.token1Balance  # ETH
-        existing_amount0_decimal = (
-            existing_amount0 / 10**self.tokenManager.token0_decimal
-        )
-        existing_amount1_decimal = (
-            existing_amount1 / 10**self.tokenManager.token1_decimal
-        )
 
-        # Get required token amounts and multiply by 1.01 to account for swap-mint slippage
-        required_amount0 = self.amount0 * 1.01
-        required_amount1 = self.amount1 * 1.01
-        required_amount0_decimal = (
-            required_amount0 / 10**self.tokenManager.token0_decimal
-        )
-        required_amount1_decimal = (
-            required_amount1 / 10**self.tokenManager.token1_decimal
-        )
+        # Get required token amounts with swap-mint slippage, in integer math so
+        # the swap amount stays an exact token amount
+        required_amount0 = self.amount0 * (100 + SWAP_MINT_SLIPPAGE_PCT) // 100
+        required_amount1 = self.amount1 * (100 + SWAP_MINT_SLIPPAGE_PCT) // 100
 
         # Get current price
-        current_price_decimal = self.uniswap.get_current_price()
-        current_price = current_price_decimal * 10**self.tokenManager.token0_decimal
-
-        # Log current price and token amounts
-        self.logger.info(f"Current price: {current_price_decimal}")
-        self.logger.info(
-            f"Existing/Required amount for {self.token0_symbol}: "
-            f"{existing_amount0_decimal } / {required_amount0_decimal}"
-        )
-        self.logger.info(
-            f"Existing/Required amount for {self.token1_symbol}: "
-            f"{existing_amount1_decimal} / {required_amount1_decimal}"
+        current_price_decimal = (
+            self.uniswap.get_current_price() if current_price is None else current_price
         )
+        current_price = current_price_decimal * self._scale0
+
+        # Log current price and token amounts, the decimal amounts are only
+        # needed for the log so they are skipped when it is filtered out
+        self.logger.info("Current price: %s", current_price_decimal)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Existing/Required amount for %s: %s / %s",
+                self.token0_symbol,
+                existing_amount0 / self._scale0,
+                required_amount0 / self._scale0,
+            )
+            self.logger.info(
+                "Existing/Required amount for %s: %s / %s",
+                self.token1_symbol,
+                existing_amount1 / self._scale1,
+                required_amount1 / self._scale1,
+            )
 
         # Both token amounts are equal or more than required
         # NO SWAP
@@ -292,15 +504,14 @@ class Web3Manager:
             raise Exception("Unexpected error")
 
         # Swap tokens
-        hex = self.uniswap.swap_token_input(
+        _, future_receipt = self.uniswap.swap_token_input(
             token_in_address=input_token,
             token_out_address=output_token,
             amount_in=swapAmount,
             pool_fee=self.pool_fee,
         )
 
-        # Get TxReceipt from HexBytes and return
-        return self.uniswap.w3.eth.getTransactionReceipt(hex)
+        return future_receipt
 
     def update_position(self):
         """Updates the position of the wallet in the pool
@@ -317,39 +528,46 @@ class Web3Manager:
         # Read current tick from Uniswap V3 contract
 
         # Save current tick and price
-        self.position_history[-1]["tick_current"] = current_tick
-        self.position_history[-1]["price_current"] = current_price
-        self.position_history[-1]["last_update"] = self.get_current_time_str()
-
-        # Save position history
-        self.store_position_history()
+        self._record_update(
+            tick_current=current_tick,
+            price_current=current_price,
+            last_update=self.get_current_time_str(),
+        )
 
-        # Only if tick is higher or lower than range close position
-        if (
-            current_tick > self.position_history[-1]["tick_upper"]
-            or current_tick < self.position_history[-1]["tick_lower"]
-        ):
-            # Log close position
-            self.logger.info("Price is outside of range. Closing position")
+        # Only if tick is higher or lower than range close position, the history
+        # is stored once at the end, even if reopening the position fails
+        try:
+            if (
+                current_tick > self.position_history[-1]["tick_upper"]
+                or current_tick < self.position_history[-1]["tick_lower"]
+            ):
+                # Log close position
+                self.logger.info("Price is outside of range. Closing position")
 
-            # Close position
-            self.close_position()
+                # Close position
+                self.close_position(store_history=False)
 
-            # Open position
-            self.open_position()
+                # Open position
+                self.open_position(store_history=False)
+        finally:
+            self.store_position_history()
 
-    def open_position(self) -> TxReceipt:
+    def open_position(self, store_history: bool = True) -> TxReceipt:
         """Open a position at Uniswap V3
-        1. Updates the balances of the wallet for token0 and token1
+        1. Updates the balances of the wallet for token0 and token1, along with the current price
         2. Swaps the tokens in the wallet for the token with the least amount
         3. Opens a position at Uniswap V3
         4. Saves the position in the position_history list
 
+        Args:
+            store_history (bool, optional): Store the position history right away,
+                otherwise it is left to the caller. Defaults to True.
+
         Returns:
             TxReceipt: Transaction receipt of the open position
         """
-        # Get current price
-        current_price = self.uniswap.get_current_price()
+        # Get current price and token amounts
+        current_price = self.get_price_and_update_balance()
 
         # Calculate ticks from currentPrice
         (
@@ -367,23 +585,33 @@ class Web3Manager:
         self.amount1, self.amount0 = self.tokenManager.calculate_amounts(
             current_price=current_price,
         )
-        self.amount0 = int(self.amount0 * 10**self.tokenManager.token0_decimal)
-        self.amount1 = int(self.amount1 * 10**self.tokenManager.token1_decimal)
-
-        # Get token amounts
-        self.update_balance()
+        self.amount0 = int(self.amount0 * self._scale0)
+        self.amount1 = int(self.amount1 * self._scale1)
 
-        # Swap tokens
-        swap_rc = self.swap_amounts()
+        # Swap tokens, with the price read together with the balances
+        future_swap = self._send_swap(current_price=current_price)
 
-        # open position at uniswap
-        rc_mint = self.uniswap.mint_liquidity(
+        # open position at uniswap, sent right behind the swap with the next
+        # nonce so it is mined after it, possibly in the same block. The mint
+        # cannot be estimated before the swapped tokens arrive, so it is sent
+        # with a fixed gas limit then
+        _, future_mint = self.uniswap.mint_liquidity(
             tick_lower=tick_low,
             tick_upper=tick_high,
             amount_0=self.amount0,
             amount_1=self.amount1,
             recipient=self.wallet_address,
+            gas=MINT_GAS_LIMIT if future_swap else None,
+        )
+        swap_rc = (
+            future_swap.result(timeout=RECEIPT_WAIT_TIMEOUT) if future_swap else None
         )
+        # A reverted swap leaves the mint without its tokens, so it is reported
+        # as the cause rather than the mint failing after it
+        if swap_rc:
+            self.check_receipt(swap_rc, "Swap")
+        rc_mint = future_mint.result(timeout=RECEIPT_WAIT_TIMEOUT)
+        self.check_receipt(rc_mint, "Mint")
 
         # Get the transaction hash from the receipt objects
         swap_tx_hash = swap_rc["transactionHash"].hex() if swap_rc else None
@@ -393,7 +621,7 @@ class Web3Manager:
         tokenId = self.parseTxReceiptForTokenId(rc=rc_mint)
 
         # Save position in position_history
-        self.position_history.append(
+        self._record_open(
             {
                 "tick_lower": tick_low,
                 "tick_upper": tick_high,
@@ -415,25 +643,50 @@ class Web3Manager:
         )
 
         # Save position history
-        self.store_position_history()
+        if store_history:
+            self.store_position_history()
 
         return rc_mint
 
-    def close_position(self) -> Tuple[TxReceipt, TxReceipt, TxReceipt]:
+    def close_position(
+        self, store_history: bool = True
+    ) -> Tuple[TxReceipt, TxReceipt, TxReceipt]:
         """Closes a position in the Uniswap V3 pool
         1. Closes the position at Uniswap V3
         2. Saves the position in the position_history list
 
+        Args:
+            store_history (bool, optional): Store the position history right away,
+                otherwise it is left to the caller. Defaults to True.
+
         Returns:
             TxReceipt: Transaction receipt of the close position
         """
         # Close position at uniswap
         token_id = self.position_history[-1]["tokenID"]
 
+        # Send the three steps back-to-back with consecutive nonces, so they can
+        # be mined in the same block. Collect and burn cannot be estimated before
+        # the decrease is mined, so they are sent with fixed gas limits
+        _, future_remove_liquidity = self.uniswap.decrease_liquidity(tokenId=token_id)
+        _, future_collect_fees = self.uniswap.collect_fees(
+            tokenId=token_id, gas=COLLECT_GAS_LIMIT
+        )
+        _, future_burn = self.uniswap.burn_token(tokenId=token_id, gas=BURN_GAS_LIMIT)
+
         # Get transaction receipts
-        receipt_remove_liquidity = self.uniswap.decrease_liquidity(tokenId=token_id)
-        receipt_collect_fees = self.uniswap.collect_fees(tokenId=token_id)
-        receipt_burn = self.uniswap.burn_token(tokenId=token_id)
+        receipt_remove_liquidity = future_remove_liquidity.result(
+            timeout=RECEIPT_WAIT_TIMEOUT
+        )
+        receipt_collect_fees = future_collect_fees.result(timeout=RECEIPT_WAIT_TIMEOUT)
+        receipt_burn = future_burn.result(timeout=RECEIPT_WAIT_TIMEOUT)
+
+        # Later steps revert too when an earlier one did, so the first failed
+        # step is reported. The position is kept open, as its liquidity may
+        # still be in the NFT
+        self.check_receipt(receipt_remove_liquidity, "Decrease liquidity")
+        self.check_receipt(receipt_collect_fees, "Collect fees")
+        self.check_receipt(receipt_burn, "Burn")
 
         # Get the transaction hash from the receipt objects
         remove_liquidity_tx_hash = receipt_remove_liquidity["transactionHash"].hex()
@@ -441,14 +694,17 @@ class Web3Manager:
         burn_tx_hash = receipt_burn["transactionHash"].hex()
 
         # Save position history
-        self.position_history[-1]["tx_decrease"] = remove_liquidity_tx_hash
-        self.position_history[-1]["tx_collect"] = collect_fees_tx_hash
-        self.position_history[-1]["tx_burn"] = burn_tx_hash
-        self.position_history[-1]["last_update"] = self.get_current_time_str()
-        self.position_history[-1]["is_open"] = False
+        self._record_update(
+            tx_decrease=remove_liquidity_tx_hash,
+            tx_collect=collect_fees_tx_hash,
+            tx_burn=burn_tx_hash,
+            last_update=self.get_current_time_str(),
+            is_open=False,
+        )
 
         # Save position history
-        self.store_position_history()
+        if store_history:
+            self.store_position_history()
 
         return (
             receipt_remove_liquidity,